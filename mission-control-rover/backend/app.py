@@ -19,10 +19,16 @@ register_socketio_events(socketio)
 from routes.mission import mission_bp
 from routes.rover import rover_bp
 from routes.status import status_bp
+from routes.audio import audio_bp
 
 app.register_blueprint(mission_bp, url_prefix='/mission')
 app.register_blueprint(rover_bp, url_prefix='/rover')
 app.register_blueprint(status_bp, url_prefix='/status')
+app.register_blueprint(audio_bp, url_prefix='/audio')
 
 if __name__ == '__main__':
+    # SIM_ROVERS=N adds N simulated rovers for load testing
+    from fleet_sim import start_simulation
+    from state_store import state
+    start_simulation(socketio, state)
     socketio.run(app, host='0.0.0.0', port=5001, debug=False, allow_unsafe_werkzeug=True)
@@ -0,0 +1,241 @@
+import io
+import math
+import os
+import re
+import struct
+import threading
+import wave
+from transcript_cache import audio_key
+
+# Distress recordings live here, one file per content hash; the oldest are
+# evicted once the store grows past AUDIO_STORE_MAX_BYTES
+AUDIO_STORE_DIR = os.environ.get("AUDIO_STORE_DIR", os.path.join(os.path.dirname(__file__), "audio"))
+AUDIO_STORE_MAX_BYTES = int(os.environ.get("AUDIO_STORE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+_HASH = re.compile(r'^[0-9a-f]{64}$')
+
+
+def sniff_type(head):
+    """Content type from the first bytes of an audio file."""
+    if head.startswith(b'\x1a\x45\xdf\xa3'):
+        return 'audio/webm'
+    if head.startswith(b'RIFF') and head[8:12] == b'WAVE':
+        return 'audio/wav'
+    if head.startswith(b'OggS'):
+        return 'audio/ogg'
+    if head.startswith(b'ID3') or head[:2] in (b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'):
+        return 'audio/mpeg'
+    return 'application/octet-stream'
+
+
+_EBML = 0x1A45DFA3
+_SEGMENT = 0x18538067
+_INFO = 0x1549A966
+_CLUSTER = 0x1F43B675
+_TIMECODE_SCALE = 0x2AD7B1
+_DURATION = 0x4489
+
+
+def _vint(buf, pos, keep_marker):
+    """EBML variable-length integer at pos: (value, next_pos); value None if 'unknown'."""
+    if pos >= len(buf):
+        raise ValueError("truncated EBML")
+    first = buf[pos]
+    length = 8 - first.bit_length() + 1
+    if first == 0 or length > (4 if keep_marker else 8) or pos + length > len(buf):
+        raise ValueError("bad EBML vint")
+    value = int.from_bytes(buf[pos:pos + length], 'big')
+    if not keep_marker:
+        value &= (1 << (7 * length)) - 1
+        if value == (1 << (7 * length)) - 1:
+            value = None  # unknown size (live-written Segment/Cluster)
+    return value, pos + length
+
+
+def _element(buf, pos):
+    """(id, data_start, data_end) of the element at pos; unknown sizes run to the buffer end."""
+    element_id, pos = _vint(buf, pos, keep_marker=True)
+    size, pos = _vint(buf, pos, keep_marker=False)
+    end = len(buf) if size is None else pos + size
+    return element_id, pos, end, size is None
+
+
+def _webm_duration(buf):
+    element_id, _, end, unknown = _element(buf, 0)
+    if element_id != _EBML or unknown:
+        return None
+    element_id, pos, segment_end, _ = _element(buf, end)
+    if element_id != _SEGMENT:
+        return None
+    segment_end = min(segment_end, len(buf))
+
+    # Segment Info precedes the first Cluster
+    while pos < segment_end:
+        element_id, start, end, unknown = _element(buf, pos)
+        if element_id == _CLUSTER or unknown:
+            return None
+        if element_id == _INFO:
+            if end > len(buf):
+                return None
+            scale, duration = 1_000_000, None  # TimecodeScale default, in ns
+            child = start
+            while child < end:
+                child_id, data, data_end, child_unknown = _element(buf, child)
+                if child_unknown or data_end > end:
+                    return None
+                raw = buf[data:data_end]
+                if child_id == _TIMECODE_SCALE and 1 <= len(raw) <= 8:
+                    scale = int.from_bytes(raw, 'big') or scale
+                elif child_id == _DURATION and len(raw) in (4, 8):
+                    duration = struct.unpack('>f' if len(raw) == 4 else '>d', raw)[0]
+                child = data_end
+            if duration is None or not math.isfinite(duration) or duration <= 0:
+                return None
+            return round(duration * scale / 1e9, 2)
+        pos = end
+    return None
+
+
+def audio_duration(audio_bytes):
+    """
+    Duration in seconds when the container records it, else None.
+
+    Reads WAV headers and the Matroska/WebM Segment Info Duration, walking
+    the EBML element tree (never the audio payload). Browser MediaRecorder
+    WebM usually has no Duration (it is written live), so the
+    client-reported duration is preferred when there is one. Anything
+    malformed or truncated gives None.
+    """
+    head = audio_bytes[:12]
+    try:
+        if head.startswith(b'RIFF') and head[8:12] == b'WAVE':
+            with wave.open(io.BytesIO(audio_bytes)) as w:
+                return round(w.getnframes() / w.getframerate(), 2)
+        if head.startswith(b'\x1a\x45\xdf\xa3'):
+            return _webm_duration(bytes(audio_bytes[:65536]))
+    except (ValueError, IndexError, EOFError, ZeroDivisionError, struct.error, wave.Error):
+        return None
+    return None
+
+
+class AudioStore:
+    """
+    Content-addressed store for decoded distress audio.
+
+    Identical recordings are stored once under their SHA-256 (the same key
+    the transcript cache uses). Alerts carry a small reference to the blob
+    instead of the audio itself, and the audio route serves it from here.
+    """
+
+    def __init__(self, directory=AUDIO_STORE_DIR, max_bytes=AUDIO_STORE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+        self.stored = 0
+        self.deduplicated = 0
+
+    def _entries(self):
+        return [entry for entry in os.scandir(self.directory)
+                if entry.is_file() and _HASH.match(entry.name)]
+
+    def path(self, audio_hash):
+        """File path for a hash, or None if the hash is malformed or unknown."""
+        if not _HASH.match(audio_hash):
+            return None
+        path = os.path.join(self.directory, audio_hash)
+        return path if os.path.exists(path) else None
+
+    def put(self, audio_bytes, duration=None):
+        """
+        Store audio (no-op if already present) and return its reference:
+        {"hash", "size", "duration", "content_type", "url"}.
+        """
+        audio_hash = audio_key(audio_bytes)
+        path = os.path.join(self.directory, audio_hash)
+        if os.path.exists(path):
+            self._reuse(path)
+        else:
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(audio_bytes)
+            self._admit(tmp, audio_hash, len(audio_bytes))
+        return self._ref(audio_hash, len(audio_bytes), audio_bytes[:65536], duration)
+
+    def adopt(self, file_path, audio_hash, size, duration=None):
+        """
+        Move an already written file (e.g. a finished streamed upload) into
+        the store under its hash, and return its reference like put().
+        The file must be on the same filesystem as the store.
+        """
+        with open(file_path, 'rb') as f:
+            head = f.read(65536)
+        path = os.path.join(self.directory, audio_hash)
+        if os.path.exists(path):
+            os.remove(file_path)
+            self._reuse(path)
+        else:
+            self._admit(file_path, audio_hash, size)
+        return self._ref(audio_hash, size, head, duration)
+
+    def _reuse(self, path):
+        os.utime(path)  # recently used: evict it last
+        with self._lock:
+            self.deduplicated += 1
+
+    def _admit(self, file_path, audio_hash, size):
+        os.replace(file_path, os.path.join(self.directory, audio_hash))
+        with self._lock:
+            self.stored += 1
+            self._size += size
+            over = self._size > self.max_bytes
+        if over:
+            self._evict(keep=audio_hash)
+
+    def _ref(self, audio_hash, size, head, duration):
+        # head: the first 64 KiB, enough for the container headers
+        if not isinstance(duration, (int, float)) or duration <= 0:
+            duration = audio_duration(head)
+        return {
+            "hash": audio_hash,
+            "size": size,
+            "duration": round(duration, 2) if duration else None,
+            "content_type": sniff_type(head[:12]),
+            "url": f"/audio/{audio_hash}",
+        }
+
+    def _evict(self, keep):
+        """Remove the least recently stored blobs until under 90% of max_bytes."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, entry.path, entry.name, stat.st_size))
+        entries.sort()
+        target = self.max_bytes * 0.9
+        for _, path, name, size in entries:
+            if self._size <= target:
+                break
+            if name == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            with self._lock:
+                self._size -= size
+
+    def stats(self):
+        return {
+            "dir": self.directory,
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "stored": self.stored,
+            "deduplicated": self.deduplicated,
+        }
+
+
+audio_store = AudioStore()
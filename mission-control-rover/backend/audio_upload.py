@@ -0,0 +1,168 @@
+import hashlib
+import os
+import re
+import threading
+from audio_store import audio_store
+
+# Limits for streamed distress recordings (Socket.IO's own message cap is
+# 1 MB, so chunks stay well under it)
+AUDIO_CHUNK_MAX_BYTES = int(os.environ.get("AUDIO_CHUNK_MAX_BYTES", str(256 * 1024)))
+AUDIO_UPLOAD_MAX_BYTES = int(os.environ.get("AUDIO_UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))
+# Each open upload holds a file descriptor until it finishes or the client leaves
+AUDIO_UPLOADS_PER_CLIENT = int(os.environ.get("AUDIO_UPLOADS_PER_CLIENT", "2"))
+
+_UPLOAD_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+class UploadError(Exception):
+    """A chunk that cannot be accepted; the message goes back in the ack."""
+
+
+class AudioUpload:
+    """One recording being streamed: an open .part file and a running hash."""
+
+    __slots__ = ('upload_id', 'sid', 'alert_id', 'meta', 'path', 'file', 'hasher',
+                 'size', 'next_seq', 'lock')
+
+    def __init__(self, upload_id, sid, alert_id, meta, path):
+        self.upload_id = upload_id
+        self.sid = sid
+        self.alert_id = alert_id
+        self.meta = meta
+        self.path = path
+        self.file = open(path, 'wb')
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.next_seq = 0
+        self.lock = threading.Lock()
+
+
+class UploadManager:
+    """
+    Chunked distress audio uploads, written to disk as they arrive.
+
+    Chunks must arrive in order (seq 0, 1, 2, ...). Each is appended to
+    uploads/<id>.part under the audio store and fed to a running SHA-256,
+    so finishing an upload is a rename into the blob store rather than a
+    second pass over the audio. A client that disconnects mid-recording
+    still has what it sent kept: finish_sid() stores the partial audio.
+    A client may have at most per_client uploads open at once.
+    """
+
+    def __init__(self, store=audio_store, chunk_max=AUDIO_CHUNK_MAX_BYTES,
+                 upload_max=AUDIO_UPLOAD_MAX_BYTES, per_client=AUDIO_UPLOADS_PER_CLIENT):
+        self.store = store
+        self.chunk_max = chunk_max
+        self.upload_max = upload_max
+        self.per_client = per_client
+        self.directory = os.path.join(store.directory, 'uploads')
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._uploads = {}
+        self.started = 0
+        self.finished = 0
+        self.chunks = 0
+        self.refused = 0
+
+    def _check_room(self, sid):
+        # Caller holds self._lock
+        if sum(1 for u in self._uploads.values() if u.sid == sid) >= self.per_client:
+            self.refused += 1
+            raise UploadError(f"At most {self.per_client} uploads open per client")
+
+    def check_room(self, sid):
+        """Raise UploadError if the client cannot open another upload now."""
+        with self._lock:
+            self._check_room(sid)
+
+    def start(self, upload_id, sid, alert_id, meta):
+        if not isinstance(upload_id, str) or not _UPLOAD_ID.match(upload_id):
+            raise UploadError("upload_id must be 32 hex characters")
+        path = os.path.join(self.directory, f"{upload_id}.part")
+        with self._lock:
+            if upload_id in self._uploads:
+                raise UploadError("Upload already started")
+            self._check_room(sid)
+            upload = self._uploads[upload_id] = AudioUpload(upload_id, sid, alert_id, meta, path)
+            self.started += 1
+        return upload
+
+    def get(self, upload_id, sid):
+        if not isinstance(upload_id, str) or not _UPLOAD_ID.match(upload_id):
+            raise UploadError("upload_id must be 32 hex characters")
+        upload = self._uploads.get(upload_id)
+        if upload is None or upload.sid != sid:
+            raise UploadError("Unknown upload")
+        return upload
+
+    def append(self, upload, seq, data):
+        """Write one chunk; returns the upload's size so far."""
+        if not isinstance(data, (bytes, bytearray)):
+            raise UploadError("Chunk data must be binary")
+        if len(data) > self.chunk_max:
+            raise UploadError(f"Chunk larger than {self.chunk_max} bytes")
+        with upload.lock:
+            if upload.file is None:
+                raise UploadError("Upload already finished")
+            if seq != upload.next_seq:
+                raise UploadError(f"Expected chunk {upload.next_seq}, got {seq}")
+            if upload.size + len(data) > self.upload_max:
+                raise UploadError(f"Upload larger than {self.upload_max} bytes")
+            upload.file.write(data)
+            upload.hasher.update(data)
+            upload.size += len(data)
+            upload.next_seq += 1
+        with self._lock:
+            self.chunks += 1
+        return upload.size
+
+    def finish(self, upload, duration=None):
+        """
+        Close the upload and move it into the blob store.
+
+        Returns:
+            dict: The audio reference, or None if nothing was received.
+        """
+        with upload.lock:
+            if upload.file is None:
+                return None
+            upload.file.close()
+            upload.file = None
+        with self._lock:
+            self._uploads.pop(upload.upload_id, None)
+            self.finished += 1
+        if upload.size == 0:
+            os.remove(upload.path)
+            return None
+        # Upload time is not recording length: without a client-reported or
+        # container duration it stays None
+        return self.store.adopt(upload.path, upload.hasher.hexdigest(), upload.size, duration)
+
+    def finish_sid(self, sid):
+        """Finish every open upload of a disconnected client; returns [(upload, ref)]."""
+        with self._lock:
+            uploads = [u for u in self._uploads.values() if u.sid == sid]
+        finished = []
+        for upload in uploads:
+            # One bad upload must not leave the client's others open
+            try:
+                audio_ref = self.finish(upload)
+            except Exception as e:
+                print(f"❌ Could not store upload {upload.upload_id}: {e!r}")
+                audio_ref = None
+            finished.append((upload, audio_ref))
+        return finished
+
+    def stats(self):
+        with self._lock:
+            return {
+                "open": len(self._uploads),
+                "open_bytes": sum(u.size for u in self._uploads.values()),
+                "started": self.started,
+                "finished": self.finished,
+                "chunks": self.chunks,
+                "refused": self.refused,
+            }
+
+
+uploads = UploadManager()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+MJPEG streaming benchmark for camera_server.py.
+
+Runs the camera server in-process against a synthetic VideoCapture stand-in
+(no USB camera needed), then connects 1..N concurrent stream clients from a
+separate process and reports, per viewer count:
+delivered fps per viewer, capture fps, JPEG encode ms/frame, end-to-end
+frame latency percentiles, server CPU and RSS.
+
+Usage:
+    python bench_camera.py
+    python bench_camera.py --viewers 1,10,50,200 --width 1280 --height 720 --fps 30
+    python bench_camera.py --async --rendition thumb --json results.json
+    python bench_camera.py --max-p95-ms 150   # exit 1 on latency regression
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import socket
+import sys
+import threading
+import time
+import numpy as np
+
+
+class SyntheticCapture:
+    """cv2.VideoCapture stand-in producing paced frames of a given size and rate."""
+
+    def __init__(self, source=None, width=1280, height=720, fps=30, variants=8):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        rng = np.random.default_rng(0)
+        # Noise + gradient + a moving block: roughly camera-like JPEG cost
+        gradient = np.linspace(0, 200, width, dtype=np.uint8)[None, :, None]
+        self._frames = []
+        for i in range(variants):
+            frame = rng.integers(0, 40, (height, width, 3), dtype=np.uint8) + gradient
+            x = (i * width // variants) % max(width - 64, 1)
+            frame[height // 3:height // 3 + 64, x:x + 64] = 255
+            self._frames.append(frame)
+        self._count = 0
+        self._next_due = None
+        self._open = True
+
+    def isOpened(self):
+        return self._open
+
+    def read(self):
+        now = time.monotonic()
+        if self._next_due is None:
+            self._next_due = now
+        if self._next_due > now:
+            time.sleep(self._next_due - now)
+        self._next_due += 1.0 / self.fps
+        frame = self._frames[self._count % len(self._frames)]
+        self._count += 1
+        return True, frame
+
+    def release(self):
+        self._open = False
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def rss_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # ru_maxrss is peak, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# ---------------------------------------------------------------------------
+# Client side (runs in a separate process so its CPU is not counted)
+# ---------------------------------------------------------------------------
+
+def read_part(stream):
+    """Headers of the next multipart frame (body consumed), or None at end of stream."""
+    while True:
+        boundary = stream.fp.readline()
+        if not boundary:
+            return None
+        if boundary.strip():
+            break
+    headers = {}
+    while True:
+        line = stream.fp.readline().strip()
+        if not line:
+            break
+        key, _, value = line.decode().partition(':')
+        headers[key.strip().lower()] = value.strip()
+    stream.fp.read(int(headers['content-length']) + 2)
+    return headers
+
+
+def read_stream(port, path, duration, ready, window, results):
+    frames = 0
+    latencies = []
+    conn = stream = None
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        conn.request('GET', path)
+        stream = conn.getresponse()
+        read_part(stream)  # streaming: ready for the measured window
+    except (OSError, KeyError, ValueError, http.client.HTTPException) as e:
+        print(f"   ⚠️  client error: {e}")
+        stream = None
+    ready.wait()
+    try:
+        deadline = window[0] + duration
+        while stream is not None and time.time() < deadline:
+            headers = read_part(stream)
+            if headers is None:
+                break
+            latencies.append(time.time() - float(headers['x-timestamp']))
+            frames += 1
+    except (OSError, KeyError, ValueError, http.client.HTTPException) as e:
+        print(f"   ⚠️  client error: {e}")
+    if conn is not None:
+        conn.close()
+    results.append((frames, latencies))
+
+
+def run_clients(port, path, viewers, duration, queue):
+    """
+    Connect every viewer, then count frames for `duration` seconds. Puts
+    'start' and 'stop' on the queue at the window's edges, so the server
+    side samples its counters over the same window, then the results.
+    """
+    results = []
+    window = []
+    ready = threading.Barrier(viewers + 1, action=lambda: window.append(time.time()))
+    threads = [
+        threading.Thread(target=read_stream, args=(port, path, duration, ready, window, results),
+                         daemon=True)
+        for _ in range(viewers)
+    ]
+    for t in threads:
+        t.start()
+    ready.wait()
+    queue.put('start')
+    time.sleep(max(0.0, window[0] + duration - time.time()))
+    queue.put('stop')
+    for t in threads:
+        t.join(15)
+    queue.put(results)
+
+
+# ---------------------------------------------------------------------------
+# Server side
+# ---------------------------------------------------------------------------
+
+def start_server(port, use_async, capture_factory):
+    import camera_server
+    from camera_devices import CameraRegistry
+
+    cameras = CameraRegistry({'bench': 'synthetic'}, capture_factory=capture_factory,
+                             ring_seconds=0, motion_threshold=0)
+    camera_server.cameras = cameras
+
+    if use_async:
+        import uvicorn
+        import camera_asgi
+        camera_asgi.cameras = cameras
+        server = uvicorn.Server(uvicorn.Config(camera_asgi.app, host='127.0.0.1', port=port,
+                                               log_level='warning', lifespan='off'))
+        threading.Thread(target=server.run, daemon=True).start()
+    else:
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        server = make_server('127.0.0.1', port, camera_server.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return cameras.get('bench')
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q) * 1000) if values else float('nan')
+
+
+def run_step(port, broadcaster, rendition, viewers, duration):
+    path = f'/bench?rendition={rendition}'
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=run_clients, args=(port, path, viewers, duration, queue))
+    proc.start()
+
+    # Counters cover only the clients' measured window, not process
+    # spawn, connecting or teardown
+    queue.get(timeout=60)  # 'start'
+    before = broadcaster.stats()
+    enc_before = before['renditions'][rendition]
+    cpu_before, wall_before = time.process_time(), time.time()
+    queue.get(timeout=duration + 60)  # 'stop'
+    cpu, wall = time.process_time() - cpu_before, time.time() - wall_before
+    after = broadcaster.stats()
+    results = queue.get(timeout=60)
+    proc.join()
+
+    enc_after = after['renditions'][rendition]
+    encoded = enc_after['encoded'] - enc_before['encoded']
+    encode_total = ((enc_after['encode_ms'] or 0) * enc_after['encoded']
+                    - (enc_before['encode_ms'] or 0) * enc_before['encoded'])
+
+    latencies = [lat for _, lats in results for lat in lats]
+    fps = [frames / duration for frames, _ in results]
+    return {
+        "viewers": viewers,
+        "connected": sum(1 for frames, _ in results if frames),
+        "fps_per_viewer": round(float(np.mean(fps)) if fps else 0.0, 1),
+        "capture_fps": round((after['frames'] - before['frames']) / wall, 1),
+        "encode_ms": round(encode_total / encoded, 2) if encoded else None,
+        "latency_p50_ms": round(percentile(latencies, 50), 1),
+        "latency_p95_ms": round(percentile(latencies, 95), 1),
+        "latency_p99_ms": round(percentile(latencies, 99), 1),
+        "cpu_percent": round(100 * cpu / wall, 1),
+        "rss_mb": round(rss_bytes() / 1024 / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark camera_server.py MJPEG streaming")
+    parser.add_argument('--viewers', default='1,5,10,25,50',
+                        help="comma-separated concurrent viewer counts")
+    parser.add_argument('--duration', type=float, default=5.0, help="seconds per step")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--fps', type=float, default=30.0, help="synthetic capture rate")
+    parser.add_argument('--rendition', default='full')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="benchmark the ASGI serving mode instead of threaded Flask")
+    parser.add_argument('--json', dest='json_path', help="also write results to this file")
+    parser.add_argument('--max-p95-ms', type=float,
+                        help="exit with status 1 if any step's p95 latency exceeds this")
+    args = parser.parse_args()
+
+    viewer_counts = [int(v) for v in args.viewers.split(',') if v.strip()]
+
+    print("=" * 70)
+    print("📷 MJPEG Streaming Benchmark")
+    print("=" * 70)
+    print(f"   Mode: {'asyncio/ASGI' if args.use_async else 'threaded Flask'}")
+    print(f"   Source: synthetic {args.width}x{args.height} @ {args.fps:g} fps")
+    print(f"   Rendition: {args.rendition}, {args.duration:g}s per step")
+    print()
+
+    port = free_port()
+    broadcaster = start_server(
+        port, args.use_async,
+        lambda source: SyntheticCapture(source, args.width, args.height, args.fps))
+
+    header = (f"{'viewers':>8} {'fps/view':>9} {'cap fps':>8} {'enc ms':>7} "
+              f"{'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'cpu %':>6} {'rss MB':>7}")
+    print(header)
+    print("-" * len(header))
+
+    results = []
+    for viewers in viewer_counts:
+        row = run_step(port, broadcaster, args.rendition, viewers, args.duration)
+        results.append(row)
+        print(f"{row['viewers']:>8} {row['fps_per_viewer']:>9} {row['capture_fps']:>8} "
+              f"{row['encode_ms'] if row['encode_ms'] is not None else '-':>7} "
+              f"{row['latency_p50_ms']:>7} {row['latency_p95_ms']:>7} {row['latency_p99_ms']:>7} "
+              f"{row['cpu_percent']:>6} {row['rss_mb']:>7}")
+        # Let the subscribers from this step disconnect before the next one
+        time.sleep(0.5)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"\n💾 Results written to {args.json_path}")
+
+    if args.max_p95_ms is not None:
+        slow = [r for r in results
+                if not r['connected'] or not r['latency_p95_ms'] <= args.max_p95_ms]
+        if slow:
+            print(f"\n❌ p95 latency above {args.max_p95_ms} ms at viewers="
+                  f"{[r['viewers'] for r in slow]}")
+            sys.exit(1)
+        print(f"\n✅ p95 latency within {args.max_p95_ms} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Fleet size benchmark for the rover registry.
+
+Registers N rovers in a StateStore and reports:
+memory per rover (plain dict records vs RoverRecord), registration rate,
+status serialization time (snapshot + compact JSON, which is what
+/status/ and full status_update emits do) after a single rover write,
+and nearest-idle-rover query time (what each distress alert pays).
+
+Usage:
+    python bench_fleet.py
+    python bench_fleet.py --rovers 10000 --repeat 20
+"""
+
+import argparse
+import gc
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from rover_record import RoverRecord
+from spatial_index import RoverLocator
+from state_store import StateStore
+
+
+def rover_fields(rng):
+    # Spread over roughly 11 x 9 km
+    return {
+        "status": "online",
+        "moving": False,
+        "lat": 37.0 + rng.uniform(0, 0.1),
+        "lon": -122.0 - rng.uniform(0, 0.1),
+        "battery": 100,
+        "last_seen": time.time(),
+    }
+
+
+def measure_bytes(build):
+    """Bytes retained by whatever build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rover registry memory/serialization benchmark")
+    parser.add_argument('--rovers', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=10, help="serialization runs to time")
+    args = parser.parse_args()
+    n = args.rovers
+
+    print("=" * 70)
+    print("🛰️  Fleet Registry Benchmark")
+    print("=" * 70)
+    print(f"   {n} rovers")
+    print()
+
+    # Records only: the fields dicts themselves are built outside the measurement
+    rng = random.Random(0)
+    fields = [rover_fields(rng) for _ in range(n)]
+    dict_bytes = measure_bytes(lambda: [dict(f) for f in fields])
+    record_bytes = measure_bytes(lambda: [RoverRecord(f) for f in fields])
+    print("💾 Memory per rover (container only; field values are shared)")
+    print(f"   dict records:      {dict_bytes / n:7.0f} B")
+    print(f"   RoverRecord:       {record_bytes / n:7.0f} B  "
+          f"({100 * record_bytes / dict_bytes:.0f}% of dict)")
+    print()
+
+    store = StateStore({"mission_state": "idle", "battery": 100, "payload": None,
+                        "priority": None, "rovers": {}})
+    started = time.perf_counter()
+    for i in range(n):
+        store.register_rover(f"rover-{i}", fields[i])
+    elapsed = time.perf_counter() - started
+    print("📝 Registration")
+    print(f"   {n / elapsed:,.0f} rovers/s ({1e6 * elapsed / n:.1f} µs each)")
+    print()
+
+    cold = []
+    warm = []
+    body = b''
+    for i in range(args.repeat):
+        # One rover moves, as between two status polls under load
+        store.update_rover(f"rover-{i % n}", lambda r: {'lat': r['lat'] + 1e-4})
+        started = time.perf_counter()
+        body = json.dumps(store.snapshot(), separators=(',', ':')).encode()
+        cold.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        store.snapshot()
+        warm.append(time.perf_counter() - started)
+
+    plain = {"rovers": {f"rover-{i}": f for i, f in enumerate(fields)}}
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        json.dumps(plain, separators=(',', ':'))
+    plain_ms = 1000 * (time.perf_counter() - started) / args.repeat
+
+    print("📦 Status serialization")
+    print(f"   body size:                 {len(body) / 1024:8.1f} KB")
+    print(f"   snapshot+encode (changed): {1000 * statistics.median(cold):8.2f} ms median")
+    print(f"   snapshot (unchanged):      {1e6 * statistics.median(warm):8.2f} µs median")
+    print(f"   encode only (plain dicts): {plain_ms:8.2f} ms")
+    print()
+
+    locator = RoverLocator(store)
+    queries = [(37.0 + (i % 97) * 1e-3, -122.0 - (i % 89) * 1e-3) for i in range(1000)]
+    started = time.perf_counter()
+    for lat, lon in queries:
+        locator.nearest_idle(lat, lon, k=3)
+    query_us = 1e6 * (time.perf_counter() - started) / len(queries)
+    print("📍 Nearest idle rovers (k=3)")
+    print(f"   {len(locator.grid)} idle rovers indexed, {query_us:.1f} µs per query")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Scheduling benchmark for the mission queue.
+
+For each (missions, rovers) size, scatters both over a city-sized area and
+reports: cost matrix build ms, greedy and optimal (scipy, if installed)
+assignment ms, and assignment quality as total distance relative to a
+lower bound (every mission paired with its nearest rover, ignoring
+conflicts). Also times one full MissionScheduler round through a
+StateStore, including the rover record writes.
+
+Usage:
+    python bench_missions.py
+    python bench_missions.py --sizes 100x200,1000x2000,2000x5000
+"""
+
+import argparse
+import random
+import time
+import numpy as np
+from mission_queue import (MissionQueue, MissionScheduler, PRIORITY_RANK, assign_greedy,
+                           cost_matrix, linear_sum_assignment)
+from state_store import StateStore
+
+
+def scatter(rng, n, spread=0.1):
+    return 37.0 + rng.uniform(0, spread, n), -122.0 - rng.uniform(0, spread, n)
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, 1000 * (time.perf_counter() - started)
+
+
+def run(n_missions, n_rovers, seed=0):
+    rng = np.random.default_rng(seed)
+    m_lat, m_lon = scatter(rng, n_missions)
+    r_lat, r_lon = scatter(rng, n_rovers)
+
+    costs, build_ms = timed(cost_matrix, m_lat, m_lon, r_lat, r_lon)
+    bound = float(costs.min(axis=1).sum()) if n_missions <= n_rovers else None
+    (rows, cols), greedy_ms = timed(assign_greedy, costs)
+    greedy_total = float(costs[rows, cols].sum())
+    row = {
+        "missions": n_missions,
+        "rovers": n_rovers,
+        "build_ms": round(build_ms, 1),
+        "greedy_ms": round(greedy_ms, 1),
+        "greedy_vs_bound": round(greedy_total / bound, 3) if bound else None,
+        "optimal_ms": None,
+        "optimal_vs_bound": None,
+    }
+    if linear_sum_assignment is not None:
+        (rows, cols), optimal_ms = timed(linear_sum_assignment, costs)
+        row["optimal_ms"] = round(optimal_ms, 1)
+        row["optimal_vs_bound"] = round(float(costs[rows, cols].sum()) / bound, 3) if bound else None
+
+    # One end-to-end round: queue pop, idle scan, matrix, solve, record writes
+    store = StateStore({"mission_state": "idle", "rovers": {}})
+    for i in range(n_rovers):
+        store.register_rover(f"rover-{i}", {"status": "online", "lat": float(r_lat[i]),
+                                            "lon": float(r_lon[i])})
+    queue = MissionQueue()
+    pick = random.Random(seed)
+    for i in range(n_missions):
+        queue.submit(m_lat[i], m_lon[i], 'supplies', pick.choice(list(PRIORITY_RANK)))
+    scheduler = MissionScheduler(queue, store, batch_size=n_missions)
+    row["round_ms"] = scheduler.schedule()["schedule_ms"]
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mission assignment scheduling benchmark")
+    parser.add_argument('--sizes', default='100x200,500x1000,1000x2000,2000x5000',
+                        help="comma-separated MISSIONSxROVERS pairs")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🗺️  Mission Scheduling Benchmark")
+    print("=" * 70)
+    print(f"   Optimal solver: {'scipy' if linear_sum_assignment is not None else 'not installed'}")
+    print("   Quality: total distance / nearest-rover lower bound (1.0 = bound)")
+    print()
+
+    header = (f"{'missions':>8} {'rovers':>7} {'build ms':>9} {'greedy ms':>10} {'greedy q':>9} "
+              f"{'opt ms':>7} {'opt q':>6} {'round ms':>9}")
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes.split(','):
+        n_missions, n_rovers = (int(x) for x in size.lower().split('x'))
+        row = run(n_missions, n_rovers)
+        print(f"{row['missions']:>8} {row['rovers']:>7} {row['build_ms']:>9} {row['greedy_ms']:>10} "
+              f"{row['greedy_vs_bound'] or '-':>9} {row['optimal_ms'] or '-':>7} "
+              f"{row['optimal_vs_bound'] or '-':>6} {row['round_ms']:>9}")
+
+
+if __name__ == '__main__':
+    main()
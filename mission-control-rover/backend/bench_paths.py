@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Path planning benchmark for path_planner.py.
+
+Generates a city-like occupancy grid (random rectangular buildings),
+builds the jump tables and plans random routes, reporting:
+table build time and memory, JPS planning latency percentiles, plain A*
+latency on a subset for comparison (with a path-length check), and the
+latency of a cached route.
+
+Usage:
+    python bench_paths.py
+    python bench_paths.py --size 3000 --buildings 6000 --queries 100
+    python bench_paths.py --grid map.npy   # benchmark a real grid
+"""
+
+import argparse
+import time
+import numpy as np
+from path_planner import JumpPointSearch, OccupancyGrid, PathPlanner, astar, path_length
+
+
+def city_grid(size, buildings, seed=0):
+    rng = np.random.default_rng(seed)
+    blocked = np.zeros((size, size), dtype=bool)
+    for _ in range(buildings):
+        h, w = rng.integers(5, max(size // 40, 6), 2)
+        y, x = rng.integers(0, size - h), rng.integers(0, size - w)
+        blocked[y:y + h, x:x + w] = True
+    return blocked
+
+
+def random_free_cells(grid, count, rng):
+    cells = []
+    while len(cells) < count:
+        x, y = int(rng.integers(1, grid.cols + 1)), int(rng.integers(1, grid.rows + 1))
+        if grid.free[y, x]:
+            cells.append((x, y))
+    return cells
+
+
+def pct(values, q):
+    return round(float(np.percentile(values, q)), 2) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grid path planning benchmark")
+    parser.add_argument('--size', type=int, default=2000, help="grid is size x size cells")
+    parser.add_argument('--buildings', type=int, default=1500)
+    parser.add_argument('--grid', help="load this .npy/image grid instead of generating one")
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--astar-queries', type=int, default=5,
+                        help="how many of the queries also run plain A*")
+    args = parser.parse_args()
+
+    if args.grid:
+        grid = OccupancyGrid.load(args.grid)
+    else:
+        grid = OccupancyGrid(city_grid(args.size, args.buildings))
+
+    print("=" * 70)
+    print("🧭 Path Planning Benchmark")
+    print("=" * 70)
+    print(f"   Grid: {grid.rows}x{grid.cols} ({grid.rows * grid.cols / 1e6:.1f}M cells, "
+          f"{100 * (1 - grid.free[1:-1, 1:-1].mean()):.0f}% blocked)")
+    print()
+
+    started = time.perf_counter()
+    jps = JumpPointSearch(grid)
+    build_s = time.perf_counter() - started
+    table_mb = 4 * 4 * grid.free.size / 1024 / 1024
+    print(f"📐 Jump tables: {build_s:.2f}s to build, {table_mb:.0f} MB")
+
+    rng = np.random.default_rng(1)
+    starts = random_free_cells(grid, args.queries, rng)
+    goals = random_free_cells(grid, args.queries, rng)
+
+    jps_ms = []
+    results = []
+    for start, goal in zip(starts, goals):
+        t = time.perf_counter()
+        results.append(jps.search(start, goal))
+        jps_ms.append(1000 * (time.perf_counter() - t))
+    found = sum(1 for r in results if r is not None)
+    print(f"⚡ JPS:   p50 {pct(jps_ms, 50)} ms, p95 {pct(jps_ms, 95)} ms, "
+          f"max {pct(jps_ms, 100)} ms ({found}/{len(results)} reachable)")
+
+    astar_ms = []
+    mismatched = 0
+    for start, goal, jps_path in list(zip(starts, goals, results))[:args.astar_queries]:
+        t = time.perf_counter()
+        reference = astar(grid, start, goal)
+        astar_ms.append(1000 * (time.perf_counter() - t))
+        if (reference is None) != (jps_path is None) or (
+                reference and abs(path_length(reference) - path_length(jps_path)) > 1e-6):
+            mismatched += 1
+    if astar_ms:
+        print(f"🐢 A*:    p50 {pct(astar_ms, 50)} ms, max {pct(astar_ms, 100)} ms "
+              f"over {len(astar_ms)} queries, {mismatched} path-length mismatches vs JPS")
+
+    planner = PathPlanner(grid)
+    start = grid.position(*starts[0])
+    goal = grid.position(*goals[0])
+    planner.route(start, goal)
+    t = time.perf_counter()
+    for _ in range(1000):
+        planner.route(start, goal)
+    print(f"💾 Cached route: {1000 * (time.perf_counter() - t):.1f} µs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the simulated fleet and the status broadcast path.
+
+Advances N simulated rovers at a fixed tick rate through the real
+StateStore and StatusBroadcaster (patch coalescing included) and reports,
+per fleet size: simulation step ms, store commit ms, broadcaster flush ms
+(merge + JSON encode of the status_patch), ops and bytes per patch, and
+the fraction of one core the whole tick uses.
+
+Usage:
+    python bench_sim.py
+    python bench_sim.py --rovers 1000,5000,10000 --hz 10 --seconds 5
+"""
+
+import argparse
+import json
+import statistics
+import time
+from fleet_sim import FleetSimulator
+from state_store import StateStore
+from status_broadcast import StatusBroadcaster
+
+
+class EncodingSink:
+    """Socket.IO stand-in that JSON-encodes each emit once, as the server would."""
+
+    def __init__(self):
+        self.patches = 0
+        self.bytes = 0
+        self.ops = 0
+
+    def emit(self, event, data):
+        self.bytes += len(json.dumps(data, separators=(',', ':')))
+        if event == 'status_patch':
+            self.patches += 1
+            self.ops += len(data['ops'])
+
+
+def run(count, hz, seconds):
+    store = StateStore({"mission_state": "idle", "battery": 100, "payload": None,
+                        "priority": None, "rovers": {}})
+    sim = FleetSimulator(store, count, tick_hz=hz)
+    sim.register()
+    sink = EncodingSink()
+    broadcaster = StatusBroadcaster(sink, store)
+
+    step, commit, flush, busy = [], [], [], []
+    ticks = int(seconds * hz)
+    for _ in range(ticks):
+        started = time.perf_counter()
+        sim.advance()
+        flushed = time.perf_counter()
+        broadcaster.flush()
+        done = time.perf_counter()
+        step.append(sim.step_ms)
+        commit.append(sim.commit_ms)
+        flush.append(1000 * (done - flushed))
+        busy.append(done - started)
+
+    return {
+        "rovers": count,
+        "step_ms": round(statistics.median(step), 2),
+        "commit_ms": round(statistics.median(commit), 2),
+        "flush_ms": round(statistics.median(flush), 2),
+        "ops_per_patch": round(sink.ops / max(sink.patches, 1)),
+        "kb_per_patch": round(sink.bytes / max(sink.patches, 1) / 1024, 1),
+        "core_percent": round(100 * statistics.mean(busy) * hz, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated fleet broadcast-path benchmark")
+    parser.add_argument('--rovers', default='100,1000,5000', help="comma-separated fleet sizes")
+    parser.add_argument('--hz', type=float, default=10.0)
+    parser.add_argument('--seconds', type=float, default=3.0, help="simulated seconds per size")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🛰️  Fleet Simulation Benchmark")
+    print("=" * 70)
+    print(f"   {args.hz:g} Hz, {args.seconds:g} simulated seconds per fleet size")
+    print()
+
+    header = (f"{'rovers':>7} {'step ms':>8} {'commit ms':>10} {'flush ms':>9} "
+              f"{'ops/patch':>10} {'KB/patch':>9} {'core %':>7}")
+    print(header)
+    print("-" * len(header))
+    for count in [int(c) for c in args.rovers.split(',') if c.strip()]:
+        row = run(count, args.hz, args.seconds)
+        print(f"{row['rovers']:>7} {row['step_ms']:>8} {row['commit_ms']:>10} "
+              f"{row['flush_ms']:>9} {row['ops_per_patch']:>10} {row['kb_per_patch']:>9} "
+              f"{row['core_percent']:>7}")
+
+
+if __name__ == '__main__':
+    main()
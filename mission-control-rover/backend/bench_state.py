@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Contention benchmark for the state store.
+
+Many controller threads hammer rover read-modify-writes while reader
+threads snapshot and JSON-serialize the whole state (what /status/ and
+status emits do). Compares three strategies:
+
+    unlocked  - the old bare SYSTEM_STATE dict, mutated in place
+    global    - the same dict behind one lock (readers serialize under it)
+    striped   - StateStore: per-rover locks + copy-on-write snapshots
+
+and reports write throughput, write/snapshot latency percentiles and lost
+updates (every write increments a counter, so the final total must match).
+
+Usage:
+    python bench_state.py
+    python bench_state.py --controllers 64 --rovers 200 --readers 4 --duration 5
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+from state_store import StateStore
+
+STEP = 0.0001
+# Latency samples kept per thread
+LATENCY_SAMPLES = 20000
+
+
+def make_initial(rovers):
+    return {
+        "mission_state": "idle",
+        "battery": 100,
+        "payload": None,
+        "priority": None,
+        "rovers": {
+            f"rover-{i}": {"status": "online", "moving": False, "lat": 0.0, "lon": 0.0, "moves": 0}
+            for i in range(rovers)
+        },
+    }
+
+
+class UnlockedState:
+    """The original pattern: one shared dict, no locking at all."""
+
+    def __init__(self, initial):
+        self.state = json.loads(json.dumps(initial))
+
+    def move(self, rover_id):
+        rover = self.state['rovers'][rover_id]
+        rover['lat'] += STEP
+        rover['moves'] += 1
+
+    def serialize(self):
+        return json.dumps(self.state)
+
+    def total_moves(self):
+        return sum(r['moves'] for r in self.state['rovers'].values())
+
+
+class GlobalLockState(UnlockedState):
+    """One big lock around every write and every serialization."""
+
+    def __init__(self, initial):
+        super().__init__(initial)
+        self.lock = threading.Lock()
+
+    def move(self, rover_id):
+        with self.lock:
+            super().move(rover_id)
+
+    def serialize(self):
+        with self.lock:
+            return super().serialize()
+
+
+class StripedState:
+    """StateStore with per-rover locks and copy-on-write snapshots."""
+
+    def __init__(self, initial):
+        self.store = StateStore(initial)
+
+    def move(self, rover_id):
+        self.store.update_rover(
+            rover_id, lambda r: {'lat': r['lat'] + STEP, 'moves': r['moves'] + 1, 'moving': True})
+
+    def serialize(self):
+        return json.dumps(self.store.snapshot())
+
+    def total_moves(self):
+        return sum(r['moves'] for r in self.store.snapshot()['rovers'].values())
+
+
+STRATEGIES = {
+    'unlocked': UnlockedState,
+    'global': GlobalLockState,
+    'striped': StripedState,
+}
+
+
+def percentile_ms(values, q):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return 1000 * values[min(int(len(values) * q / 100), len(values) - 1)]
+
+
+def run(strategy, args):
+    target = STRATEGIES[strategy](make_initial(args.rovers))
+    rover_ids = [f"rover-{i}" for i in range(args.rovers)]
+    stop = threading.Event()
+    # Per-thread latency samples are capped (most recent kept) so a slow
+    # strategy under heavy contention cannot grow them without bound
+    write_lat = [deque(maxlen=LATENCY_SAMPLES) for _ in range(args.controllers)]
+    read_lat = [deque(maxlen=LATENCY_SAMPLES) for _ in range(args.readers)]
+    writes = [0] * args.controllers
+    reads = [0] * args.readers
+    # Nobody starts hammering until every thread is up: otherwise early
+    # threads starve the main thread's Thread.start() calls
+    ready = threading.Barrier(args.controllers + args.readers + 1)
+
+    def controller(idx):
+        rng = random.Random(idx)
+        lat = write_lat[idx]
+        ready.wait()
+        while not stop.is_set():
+            rover_id = rng.choice(rover_ids)
+            started = time.perf_counter()
+            target.move(rover_id)
+            lat.append(time.perf_counter() - started)
+            writes[idx] += 1
+
+    def reader(idx):
+        lat = read_lat[idx]
+        ready.wait()
+        while not stop.is_set():
+            started = time.perf_counter()
+            target.serialize()
+            lat.append(time.perf_counter() - started)
+            reads[idx] += 1
+
+    threads = [threading.Thread(target=controller, args=(i,)) for i in range(args.controllers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    for t in threads:
+        t.start()
+    ready.wait()
+    started = time.perf_counter()
+    time.sleep(args.duration)
+    stop.set()
+    elapsed = time.perf_counter() - started
+    for t in threads:
+        t.join()
+
+    all_writes = [x for lat in write_lat for x in lat]
+    all_reads = [x for lat in read_lat for x in lat]
+    total = sum(writes)
+    return {
+        "strategy": strategy,
+        "writes_per_s": round(total / elapsed),
+        "write_p50_ms": round(percentile_ms(all_writes, 50), 3),
+        "write_p99_ms": round(percentile_ms(all_writes, 99), 3),
+        "snapshots_per_s": round(sum(reads) / elapsed),
+        "snapshot_p50_ms": round(percentile_ms(all_reads, 50), 3),
+        "snapshot_p99_ms": round(percentile_ms(all_reads, 99), 3),
+        "lost_updates": total - target.total_moves(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="State store contention benchmark")
+    parser.add_argument('--controllers', type=int, default=32, help="concurrent writer threads")
+    parser.add_argument('--readers', type=int, default=2, help="concurrent snapshot+serialize threads")
+    parser.add_argument('--rovers', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=3.0, help="seconds per strategy")
+    parser.add_argument('--strategies', default=','.join(STRATEGIES))
+    parser.add_argument('--switch-interval', type=float,
+                        help="sys.setswitchinterval override; smaller values force more preemption")
+    args = parser.parse_args()
+    if args.switch_interval:
+        sys.setswitchinterval(args.switch_interval)
+
+    print("=" * 70)
+    print("🔒 State Store Contention Benchmark")
+    print("=" * 70)
+    print(f"   {args.controllers} controllers, {args.readers} readers, "
+          f"{args.rovers} rovers, {args.duration:g}s per strategy")
+    print()
+
+    header = (f"{'strategy':>9} {'writes/s':>9} {'w p50 ms':>9} {'w p99 ms':>9} "
+              f"{'snaps/s':>8} {'s p50 ms':>9} {'s p99 ms':>9} {'lost':>6}")
+    print(header)
+    print("-" * len(header))
+    for strategy in args.strategies.split(','):
+        row = run(strategy.strip(), args)
+        print(f"{row['strategy']:>9} {row['writes_per_s']:>9} {row['write_p50_ms']:>9} "
+              f"{row['write_p99_ms']:>9} {row['snapshots_per_s']:>8} {row['snapshot_p50_ms']:>9} "
+              f"{row['snapshot_p99_ms']:>9} {row['lost_updates']:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Asyncio (ASGI) serving mode for the camera server.
+
+Each MJPEG viewer is a coroutine with a small asyncio.Queue instead of a
+WSGI worker thread. One bridge subscriber per camera rendition receives
+frames from the capture thread and fans them out on the event loop, so
+thousands of idle or slow viewers cost a queue and a task each.
+
+Stream routes are served natively; everything else (snapshots, replay,
+export, stats) falls through to the Flask app.
+
+Run with:
+    python camera_server.py --async
+    # or: uvicorn camera_asgi:app --host 0.0.0.0 --port 8000
+"""
+
+import asyncio
+import itertools
+import json
+import time
+from urllib.parse import parse_qs
+from uvicorn.middleware.wsgi import WSGIMiddleware
+from camera_server import app as flask_app, cameras
+from camera_stream import FrameSubscriber, RENDITIONS, DEFAULT_RENDITION, mjpeg_part
+
+MJPEG_HEADERS = [
+    (b'content-type', b'multipart/x-mixed-replace; boundary=frame'),
+    (b'cache-control', b'no-cache'),
+]
+
+
+class AsyncViewer:
+    """One async MJPEG client: a bounded drop-oldest queue plus counters."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, depth, client=None):
+        self.id = next(self._ids)
+        self.client = client
+        self.delivered = 0
+        self.dropped = 0
+        self.connected_at = time.time()
+        self.closing = False
+        self.queue = asyncio.Queue(maxsize=depth)
+
+    def offer(self, item):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(item)
+
+    def close(self):
+        # The flag is the signal; None only wakes the stream coroutine up
+        # (later frames may push it out of the queue, but wake it as well)
+        self.closing = True
+        self.offer(None)
+
+    def stats(self):
+        return {
+            "id": self.id,
+            "client": self.client,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "queued": self.queue.qsize(),
+            "connected_for": round(time.time() - self.connected_at, 1),
+        }
+
+
+class BridgeSubscriber(FrameSubscriber):
+    """Capture-thread subscriber that hands frames to the event loop instead of queueing them."""
+
+    def __init__(self, fanout, loop, rendition):
+        super().__init__(depth=1, client='asgi', rendition=rendition)
+        self.fanout = fanout
+        self.loop = loop
+
+    def push(self, seq, frame, timestamp):
+        self.delivered += 1
+        self.loop.call_soon_threadsafe(self.fanout.dispatch, (seq, frame, timestamp))
+
+    def close(self):
+        # Unsubscribing closes the bridge too: report it to the fanout once
+        if self.closed:
+            return
+        super().close()
+        self.loop.call_soon_threadsafe(self.fanout.closed, self)
+
+
+class AsyncFanout:
+    """
+    Fans frames of one camera rendition out to async viewers.
+
+    Holds a single broadcaster subscription while at least one viewer is
+    connected, so idle renditions stop encoding and idle devices close.
+    """
+
+    def __init__(self, broadcaster, rendition, depth):
+        self.broadcaster = broadcaster
+        self.rendition = rendition
+        self.depth = depth
+        self.viewers = set()
+        self._bridge = None
+
+    def join(self, client=None):
+        viewer = AsyncViewer(self.depth, client)
+        self.viewers.add(viewer)
+        if self._bridge is None:
+            self._bridge = BridgeSubscriber(self, asyncio.get_running_loop(), self.rendition)
+            self.broadcaster.attach(self._bridge)
+        return viewer
+
+    def leave(self, viewer):
+        self.viewers.discard(viewer)
+        if not self.viewers and self._bridge is not None:
+            bridge, self._bridge = self._bridge, None
+            self.broadcaster.unsubscribe(bridge)
+
+    def dispatch(self, item):
+        for viewer in self.viewers:
+            viewer.offer(item)
+
+    def closed(self, bridge):
+        # Capture stopped (device error): detach the dead bridge and end
+        # every stream; the next viewer attaches a fresh bridge and reopens
+        self.broadcaster.unsubscribe(bridge)
+        if bridge is not self._bridge:
+            return
+        self._bridge = None
+        for viewer in list(self.viewers):
+            viewer.close()
+
+
+_fanouts = {}
+
+
+def get_fanout(broadcaster, rendition):
+    key = (id(broadcaster), rendition)
+    if key not in _fanouts:
+        _fanouts[key] = AsyncFanout(broadcaster, rendition, broadcaster.queue_depth)
+    return _fanouts[key]
+
+
+async def send_json(send, status, payload):
+    body = json.dumps(payload).encode()
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def stream_camera(scope, receive, send, broadcaster):
+    query = parse_qs(scope.get('query_string', b'').decode())
+    rendition = query.get('rendition', [DEFAULT_RENDITION])[0]
+    if rendition not in RENDITIONS:
+        await send_json(send, 400, {"error": f"Invalid rendition, expected one of {list(RENDITIONS)}"})
+        return
+
+    client = scope.get('client')
+    fanout = get_fanout(broadcaster, rendition)
+    viewer = fanout.join(client[0] if client else None)
+
+    async def watch_disconnect():
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                viewer.close()
+                return
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': MJPEG_HEADERS})
+        while not viewer.closing:
+            item = await viewer.queue.get()
+            if item is None or viewer.closing:
+                break
+            viewer.delivered += 1
+            await send({'type': 'http.response.body', 'body': mjpeg_part(*item), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        watcher.cancel()
+        fanout.leave(viewer)
+
+
+def async_stats():
+    stats = {}
+    for fanout in _fanouts.values():
+        entry = stats.setdefault(fanout.broadcaster.name, {})
+        entry[fanout.rendition] = [v.stats() for v in fanout.viewers]
+    return stats
+
+
+_wsgi = WSGIMiddleware(flask_app)
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                cameras.start_recording()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    if scope['type'] == 'http' and scope['method'] == 'GET':
+        path = scope['path'].strip('/')
+        if path == 'stats/async':
+            await send_json(send, 200, async_stats())
+            return
+        broadcaster = cameras.get(path)
+        if broadcaster is not None:
+            await stream_camera(scope, receive, send, broadcaster)
+            return
+
+    await _wsgi(scope, receive, send)
@@ -0,0 +1,93 @@
+import os
+import cv2
+from camera_stream import FrameBroadcaster, RENDITIONS
+from frame_ring import FrameRing
+
+# Camera configuration: comma-separated name=source pairs. A source is a
+# device index (e.g. 0) or a capture URL (e.g. rtsp://10.0.0.5/stream).
+# Cameras that name the same source share one capture.
+CAMERA_SOURCES = os.environ.get("CAMERA_SOURCES", "jetson=0,pi=0")
+CAMERA_IDLE_TIMEOUT = float(os.environ.get("CAMERA_IDLE_TIMEOUT", "30"))
+
+# Motion gating: skip frames whose mean grey-level change is below the
+# threshold (0 disables), but still send one every CAMERA_KEEPALIVE seconds
+CAMERA_MOTION_THRESHOLD = float(os.environ.get("CAMERA_MOTION_THRESHOLD", "0"))
+CAMERA_KEEPALIVE = float(os.environ.get("CAMERA_KEEPALIVE", "2"))
+
+# Instant replay: keep the last CAMERA_RING_SECONDS of CAMERA_RING_RENDITION
+# frames per device in a CAMERA_RING_MB memory-mapped ring (0 disables).
+# Recording cameras stay open even with no viewers.
+CAMERA_RING_SECONDS = float(os.environ.get("CAMERA_RING_SECONDS", "0"))
+CAMERA_RING_MB = int(os.environ.get("CAMERA_RING_MB", "64"))
+CAMERA_RING_RENDITION = os.environ.get("CAMERA_RING_RENDITION", "medium")
+CAMERA_RING_DIR = os.environ.get("CAMERA_RING_DIR") or None
+
+
+def parse_sources(spec):
+    """
+    Parse a CAMERA_SOURCES string into {camera_name: source}.
+
+    Numeric sources become device indices, anything else is passed to
+    cv2.VideoCapture as-is.
+    """
+    sources = {}
+    for entry in spec.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, source = entry.partition('=')
+        if not sep or not name.strip() or not source.strip():
+            raise ValueError(f"Invalid camera entry '{entry}', expected name=source")
+        source = source.strip()
+        sources[name.strip()] = int(source) if source.isdigit() else source
+    return sources
+
+
+class CameraRegistry:
+    """
+    Lazily opened capture devices keyed by camera name.
+
+    Nothing is opened at startup: each FrameBroadcaster opens its device on
+    the first subscriber and closes it after the idle timeout.
+    """
+
+    def __init__(self, sources, idle_timeout=CAMERA_IDLE_TIMEOUT,
+                 capture_factory=cv2.VideoCapture,
+                 motion_threshold=CAMERA_MOTION_THRESHOLD, keepalive=CAMERA_KEEPALIVE,
+                 ring_seconds=CAMERA_RING_SECONDS, ring_mb=CAMERA_RING_MB,
+                 ring_rendition=CAMERA_RING_RENDITION):
+        if ring_rendition not in RENDITIONS:
+            raise ValueError(f"Unknown ring rendition: {ring_rendition}")
+        self._cameras = {}
+        by_source = {}
+        for name, source in sources.items():
+            if source not in by_source:
+                ring = None
+                if ring_seconds > 0:
+                    ring = FrameRing(name, ring_mb * 1024 * 1024,
+                                     max_age=ring_seconds, directory=CAMERA_RING_DIR)
+                by_source[source] = FrameBroadcaster(
+                    source, name=name, idle_timeout=idle_timeout,
+                    capture_factory=capture_factory,
+                    motion_threshold=motion_threshold, keepalive=keepalive,
+                    ring=ring, record_rendition=ring_rendition)
+            self._cameras[name] = by_source[source]
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        return cls(parse_sources(CAMERA_SOURCES), **kwargs)
+
+    def start_recording(self):
+        """Open every device that has a replay ring so history builds up before anyone asks."""
+        for broadcaster in set(self._cameras.values()):
+            if broadcaster.ring is not None:
+                broadcaster.start()
+
+    def get(self, name):
+        return self._cameras.get(name)
+
+    def names(self):
+        return list(self._cameras)
+
+    def stats(self):
+        return {name: b.stats() for name, b in self._cameras.items()}
@@ -1,30 +1,138 @@
-from flask import Flask, Response
-import cv2
+import sys
+import time
+from flask import Flask, Response, jsonify, request
+from camera_devices import CameraRegistry
+from camera_stream import RENDITIONS, DEFAULT_RENDITION, gen, mjpeg_part
 
 app = Flask(__name__)
 
-jetson_cam = cv2.VideoCapture(0)  # USB camera
-pi_cam = cv2.VideoCapture(0)      # same cam for demo (change later)
-
-def gen(cam):
-    while True:
-        success, frame = cam.read()
-        if not success:
-            break
-        _, buffer = cv2.imencode('.jpg', frame)
-        frame = buffer.tobytes()
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-
-@app.route('/jetson')
-def jetson_feed():
-    return Response(gen(jetson_cam),
+# Devices come from CAMERA_SOURCES and are only opened while someone is watching
+cameras = CameraRegistry.from_env()
+
+def replay_range(broadcaster):
+    """
+    Resolve the requested time range for replay/export.
+
+    Accepts ?start=&end= as unix timestamps, or ?seconds=N for the last N
+    seconds (defaults to the whole ring).
+    """
+    try:
+        if 'start' in request.args or 'end' in request.args:
+            start = float(request.args['start']) if 'start' in request.args else None
+            end = float(request.args['end']) if 'end' in request.args else None
+        else:
+            seconds = float(request.args.get('seconds', broadcaster.ring.max_age))
+            start, end = time.time() - seconds, None
+    except ValueError:
+        return None
+    return start, end
+
+def recorded_frames(ring, start, end):
+    # Copy each JPEG straight out of the mmap; frames overwritten mid-read are skipped
+    for entry in ring.entries(start, end):
+        frame = ring.read(entry)
+        if frame is not None:
+            yield entry, frame
+
+@app.route('/<camera>')
+def camera_feed(camera):
+    broadcaster = cameras.get(camera)
+    if broadcaster is None:
+        return jsonify({"error": f"Unknown camera, expected one of {cameras.names()}"}), 404
+
+    # ?rendition=full|medium|thumb picks a precomputed resolution/quality/fps
+    rendition = request.args.get('rendition', DEFAULT_RENDITION)
+    if rendition not in RENDITIONS:
+        return jsonify({"error": f"Invalid rendition, expected one of {list(RENDITIONS)}"}), 400
+    return Response(gen(broadcaster, client=request.remote_addr, rendition=rendition),
                     mimetype='multipart/x-mixed-replace; boundary=frame')
 
-@app.route('/pi')
-def pi_feed():
-    return Response(gen(pi_cam),
+@app.route('/<camera>/snapshot.jpg')
+def camera_snapshot(camera):
+    broadcaster = cameras.get(camera)
+    if broadcaster is None:
+        return jsonify({"error": f"Unknown camera, expected one of {cameras.names()}"}), 404
+
+    rendition = request.args.get('rendition', DEFAULT_RENDITION)
+    if rendition not in RENDITIONS:
+        return jsonify({"error": f"Invalid rendition, expected one of {list(RENDITIONS)}"}), 400
+
+    # Serve the frame the capture loop already encoded; never capture/encode here
+    seq, frame = broadcaster.wait_latest(rendition)
+    if frame is None:
+        return jsonify({"error": "No frame available yet"}), 503, {'Retry-After': '1'}
+
+    etag = f'{broadcaster.epoch}-{rendition}-{seq}'
+    headers = {'X-Frame-Seq': str(seq), 'Cache-Control': 'no-cache'}
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={**headers, 'ETag': f'"{etag}"'})
+
+    response = Response(frame, mimetype='image/jpeg', headers=headers)
+    response.set_etag(etag)
+    return response
+
+@app.route('/<camera>/replay')
+def camera_replay(camera):
+    broadcaster = cameras.get(camera)
+    if broadcaster is None:
+        return jsonify({"error": f"Unknown camera, expected one of {cameras.names()}"}), 404
+    if broadcaster.ring is None:
+        return jsonify({"error": "Recording is disabled (set CAMERA_RING_SECONDS)"}), 404
+    frame_range = replay_range(broadcaster)
+    if frame_range is None:
+        return jsonify({"error": "start, end and seconds must be numbers"}), 400
+    try:
+        speed = max(float(request.args.get('speed', 1)), 0.1)
+    except ValueError:
+        return jsonify({"error": "speed must be a number"}), 400
+
+    def gen_replay(frames):
+        # Pace recorded frames with their original spacing
+        previous = None
+        for entry, frame in frames:
+            if previous is not None:
+                time.sleep(min(max(entry.timestamp - previous, 0) / speed, 1.0))
+            previous = entry.timestamp
+            yield mjpeg_part(entry.seq, frame, entry.timestamp)
+
+    return Response(gen_replay(recorded_frames(broadcaster.ring, *frame_range)),
                     mimetype='multipart/x-mixed-replace; boundary=frame')
 
+@app.route('/<camera>/export.mjpeg')
+def camera_export(camera):
+    broadcaster = cameras.get(camera)
+    if broadcaster is None:
+        return jsonify({"error": f"Unknown camera, expected one of {cameras.names()}"}), 404
+    if broadcaster.ring is None:
+        return jsonify({"error": "Recording is disabled (set CAMERA_RING_SECONDS)"}), 404
+    frame_range = replay_range(broadcaster)
+    if frame_range is None:
+        return jsonify({"error": "start, end and seconds must be numbers"}), 400
+
+    # Raw MJPEG: the recorded JPEGs back to back, playable with ffplay/VLC
+    filename = f"{camera}-{int(time.time())}.mjpeg"
+    frames = recorded_frames(broadcaster.ring, *frame_range)
+    return Response((frame for _, frame in frames),
+                    mimetype='video/x-motion-jpeg',
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+@app.route('/renditions')
+def list_renditions():
+    return jsonify({
+        name: {"max_width": width, "quality": quality, "max_fps": max_fps}
+        for name, (width, quality, max_fps) in RENDITIONS.items()
+    })
+
+@app.route('/stats')
+def stream_stats():
+    # Per-viewer delivered/dropped counters for each camera
+    return jsonify(cameras.stats())
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8000, threaded=True)
+    if '--async' in sys.argv:
+        # Asyncio mode: one coroutine per viewer instead of one thread
+        import uvicorn
+        uvicorn.run('camera_asgi:app', host='0.0.0.0', port=8000)
+    else:
+        cameras.start_recording()
+        app.run(host='0.0.0.0', port=8000, threaded=True)
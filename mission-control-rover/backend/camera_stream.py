@@ -0,0 +1,371 @@
+import itertools
+import threading
+import time
+from collections import deque
+import cv2
+import numpy as np
+
+# Precomputed renditions: name -> (max width in px or None for native,
+# JPEG quality, max fps or None for every captured frame)
+RENDITIONS = {
+    'full': (None, 85, None),
+    'medium': (640, 70, 15),
+    'thumb': (320, 50, 5),
+}
+DEFAULT_RENDITION = 'full'
+
+# Encode rate for renditions that only have snapshot pollers, no streams
+SNAPSHOT_FPS = 2
+
+# Motion gate compares grayscale thumbnails sampled every Nth pixel
+MOTION_SAMPLE_STEP = 8
+
+
+def motion_thumbnail(frame):
+    """Cheap downsampled grayscale copy of a BGR frame for frame differencing."""
+    return frame[::MOTION_SAMPLE_STEP, ::MOTION_SAMPLE_STEP].mean(axis=2, dtype=np.float32)
+
+
+class FrameSubscriber:
+    """
+    Bounded per-viewer frame queue.
+
+    The capture loop never waits on a viewer: when the queue is full the
+    oldest frame is dropped, so a slow client only ever sees fresh frames.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, depth=2, client=None, rendition=DEFAULT_RENDITION):
+        self.id = next(self._ids)
+        self.client = client
+        self.rendition = rendition
+        self.delivered = 0
+        self.dropped = 0
+        self.connected_at = time.time()
+        self._queue = deque(maxlen=depth)
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def push(self, seq, frame, timestamp):
+        with self._cond:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append((seq, frame, timestamp))
+            self._cond.notify()
+
+    def get(self, timeout=5.0):
+        """Return the next (seq, jpeg_bytes, capture_time), or None on close/timeout."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._queue or self._closed, timeout)
+            if not self._queue:
+                return None
+            self.delivered += 1
+            return self._queue.popleft()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def stats(self):
+        return {
+            "id": self.id,
+            "client": self.client,
+            "rendition": self.rendition,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "queued": len(self._queue),
+            "connected_for": round(time.time() - self.connected_at, 1),
+        }
+
+
+class FrameBroadcaster:
+    """
+    Grabs frames from one capture device on a single thread and encodes
+    each subscribed rendition at most once per captured frame.
+
+    The device is opened by the first subscriber and released again after
+    idle_timeout seconds without viewers; the next subscriber reopens it.
+
+    With a motion_threshold set, frames whose thumbnail differs from the
+    last published frame by less than the threshold (mean absolute grey
+    level change, 0-255) are skipped before encoding, except for one
+    keepalive frame every keepalive seconds.
+
+    With a FrameRing attached, record_rendition is encoded for every frame
+    (within its max fps) and appended to the ring, and the device is kept
+    open regardless of viewers so there is always history to replay.
+
+    Every viewer subscribes instead of calling cam.read() itself, so a
+    stream costs the same for 1 or 50 operators. Renditions nobody is
+    watching are never resized or encoded.
+    """
+
+    def __init__(self, source, name='camera', queue_depth=2, idle_timeout=30.0,
+                 capture_factory=cv2.VideoCapture, motion_threshold=0.0, keepalive=2.0,
+                 ring=None, record_rendition='medium'):
+        self.source = source
+        self.name = name
+        self.queue_depth = queue_depth
+        self.idle_timeout = idle_timeout
+        self.capture_factory = capture_factory
+        self.motion_threshold = motion_threshold
+        self.keepalive = keepalive
+        self.ring = ring
+        self.record_rendition = record_rendition
+        self.cam = None
+        self.frames = 0
+        self.skipped = 0
+        self._motion_ref = None
+        self._last_published = 0.0
+        self.opens = 0
+        self._lock = threading.Lock()
+        self._frame_ready = threading.Condition(self._lock)
+        self._subscribers = {r: [] for r in RENDITIONS}
+        self._latest = {r: (0, None) for r in RENDITIONS}
+        self._last_encode = {r: 0.0 for r in RENDITIONS}
+        self._last_polled = {r: float('-inf') for r in RENDITIONS}
+        self._encoded = {r: 0 for r in RENDITIONS}
+        self._encode_seconds = {r: 0.0 for r in RENDITIONS}
+        self._last_active = time.monotonic()
+        self._seq = 0
+        # Distinguishes frame sequence numbers across restarts (for ETags)
+        self.epoch = int(time.time())
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            previous = self._thread
+            self._thread = threading.Thread(
+                target=self._capture_loop, args=(previous,),
+                name=f'capture-{self.name}', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+
+    @property
+    def running(self):
+        return self._running
+
+    def latest(self, rendition=DEFAULT_RENDITION):
+        """Most recent (seq, jpeg_bytes) for a rendition, or (0, None) before the first frame."""
+        return self._latest[rendition]
+
+    def wait_latest(self, rendition=DEFAULT_RENDITION, timeout=2.0):
+        """
+        Return the cached frame for a snapshot poller without encoding anything.
+
+        Polling keeps the device open and the rendition encoded (at up to
+        SNAPSHOT_FPS) for idle_timeout seconds. Only the very first poll of a
+        closed device waits, up to timeout, for the capture to produce a frame.
+        """
+        with self._lock:
+            self._last_polled[rendition] = time.monotonic()
+        self.start()
+        with self._frame_ready:
+            self._frame_ready.wait_for(
+                lambda: self._latest[rendition][1] is not None or not self._running,
+                timeout)
+            return self._latest[rendition]
+
+    def subscribe(self, client=None, rendition=DEFAULT_RENDITION):
+        if rendition not in RENDITIONS:
+            raise ValueError(f"Unknown rendition: {rendition}")
+        return self.attach(FrameSubscriber(self.queue_depth, client, rendition))
+
+    def attach(self, subscriber):
+        """Register an already-built subscriber (anything with push/close) and start capturing."""
+        with self._lock:
+            self._subscribers[subscriber.rendition].append(subscriber)
+            self._last_active = time.monotonic()
+        self.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            subscribers = self._subscribers[subscriber.rendition]
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            self._last_active = time.monotonic()
+        subscriber.close()
+
+    def _has_subscribers(self):
+        return any(self._subscribers.values())
+
+    def _is_recorded(self, rendition):
+        return self.ring is not None and rendition == self.record_rendition
+
+    def _is_polled(self, rendition, now):
+        return now - self._last_polled[rendition] < self.idle_timeout
+
+    def _encode_interval(self, rendition, now):
+        """Minimum seconds between encodes of a rendition, or None to skip it."""
+        _, _, max_fps = RENDITIONS[rendition]
+        if self._subscribers[rendition] or self._is_recorded(rendition):
+            return 1.0 / max_fps if max_fps else 0.0
+        if self._is_polled(rendition, now):
+            return 1.0 / min(max_fps or SNAPSHOT_FPS, SNAPSHOT_FPS)
+        return None
+
+    def _idle_expired(self):
+        """Stop capturing once nobody has watched for idle_timeout seconds."""
+        with self._lock:
+            now = time.monotonic()
+            if self.ring is not None or self._has_subscribers() or any(self._is_polled(r, now) for r in RENDITIONS):
+                self._last_active = now
+                return False
+            if now - self._last_active < self.idle_timeout:
+                return False
+            self._running = False
+            return True
+
+    def _is_static(self, frame, now):
+        """True if the frame can be skipped because nothing moved since the last one sent."""
+        if not self.motion_threshold:
+            return False
+        thumb = motion_thumbnail(frame)
+        ref = self._motion_ref
+        if (ref is not None and ref.shape == thumb.shape
+                and now - self._last_published < self.keepalive
+                and np.abs(thumb - ref).mean() < self.motion_threshold):
+            return True
+        self._motion_ref = thumb
+        self._last_published = now
+        return False
+
+    def _capture_loop(self, previous):
+        # Let a capture thread that is shutting down release the device first
+        if previous is not None:
+            previous.join()
+
+        cam = self.capture_factory(self.source)
+        if cam.isOpened():
+            self.cam = cam
+            self.opens += 1
+            print(f"📷 Camera {self.name}: opened {self.source}")
+        else:
+            print(f"❌ Camera {self.name}: could not open {self.source}")
+            self._running = False
+
+        try:
+            while self._running:
+                if self._idle_expired():
+                    print(f"💤 Camera {self.name}: idle for {self.idle_timeout}s, closing")
+                    break
+                success, frame = cam.read()
+                if not success:
+                    print(f"❌ Camera {self.name}: read failed, stopping capture")
+                    break
+                captured_at = time.time()
+                self.frames += 1
+                now = time.monotonic()
+                if self._is_static(frame, now):
+                    self.skipped += 1
+                    continue
+                self._seq += 1
+                for rendition, (width, quality, _) in RENDITIONS.items():
+                    interval = self._encode_interval(rendition, now)
+                    if interval is None or now - self._last_encode[rendition] < interval:
+                        continue
+                    self._last_encode[rendition] = now
+                    started = time.perf_counter()
+                    jpeg = self._encode(frame, width, quality)
+                    self._encode_seconds[rendition] += time.perf_counter() - started
+                    self._publish(rendition, jpeg, captured_at)
+        finally:
+            cam.release()
+            self.cam = None
+
+        with self._lock:
+            # A viewer that attached during shutdown already started a
+            # successor thread (waiting on our join): leave it and its
+            # subscribers alone
+            if self._thread is not threading.current_thread():
+                return
+            self._running = False
+            self._frame_ready.notify_all()
+            subscribers = [s for subs in self._subscribers.values() for s in subs]
+        for subscriber in subscribers:
+            subscriber.close()
+
+    @staticmethod
+    def _encode(frame, width, quality):
+        if width and frame.shape[1] > width:
+            height = int(frame.shape[0] * width / frame.shape[1])
+            frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return buffer.tobytes()
+
+    def _publish(self, rendition, jpeg, captured_at):
+        seq = self._seq
+        with self._lock:
+            self._latest[rendition] = (seq, jpeg)
+            self._encoded[rendition] += 1
+            self._frame_ready.notify_all()
+            subscribers = list(self._subscribers[rendition])
+        for subscriber in subscribers:
+            subscriber.push(seq, jpeg, captured_at)
+        if self._is_recorded(rendition):
+            self.ring.append(seq, captured_at, jpeg)
+
+    def stats(self):
+        with self._lock:
+            renditions = {
+                r: {
+                    "encoded": self._encoded[r],
+                    "encode_ms": round(1000 * self._encode_seconds[r] / self._encoded[r], 2)
+                    if self._encoded[r] else None,
+                    "subscribers": [s.stats() for s in subs],
+                }
+                for r, subs in self._subscribers.items()
+            }
+        return {
+            "name": self.name,
+            "source": self.source,
+            "running": self._running,
+            "device_open": self.cam is not None,
+            "opens": self.opens,
+            "frames": self.frames,
+            "motion": {
+                "threshold": self.motion_threshold,
+                "skipped": self.skipped,
+                "skip_ratio": round(self.skipped / self.frames, 3) if self.frames else 0.0,
+            },
+            "renditions": renditions,
+            "recording": self.ring.stats() if self.ring is not None else None,
+        }
+
+
+def mjpeg_part(seq, frame, timestamp):
+    """One multipart/x-mixed-replace part, tagged with its frame sequence and capture time."""
+    return (b'--frame\r\n'
+            b'Content-Type: image/jpeg\r\n'
+            b'Content-Length: ' + str(len(frame)).encode() + b'\r\n'
+            b'X-Frame-Seq: ' + str(seq).encode() + b'\r\n'
+            b'X-Timestamp: ' + repr(timestamp).encode() + b'\r\n\r\n'
+            + frame + b'\r\n')
+
+
+def gen(broadcaster, client=None, rendition=DEFAULT_RENDITION):
+    subscriber = broadcaster.subscribe(client, rendition)
+    try:
+        while True:
+            item = subscriber.get()
+            if item is None:
+                if subscriber.closed:
+                    break
+                continue
+            seq, frame, timestamp = item
+            yield mjpeg_part(seq, frame, timestamp)
+    finally:
+        broadcaster.unsubscribe(subscriber)
@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from collections import deque
+from rover_commands import execute_commands
+
+# Per-rover limits: applied batches per second, and queued commands before
+# new ones are rejected
+ROVER_MAX_COMMAND_RATE = float(os.environ.get("ROVER_MAX_COMMAND_RATE", "20"))
+ROVER_QUEUE_LIMIT = int(os.environ.get("ROVER_QUEUE_LIMIT", "256"))
+
+
+class CommandTicket:
+    """Completion handle for submitted commands; resolves to the rover's new record."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self.rover = None
+
+    def resolve(self, rover):
+        self.rover = rover
+        self._done.set()
+
+    def wait(self, timeout=None):
+        """Return the rover record after apply, or None on timeout/failure."""
+        self._done.wait(timeout)
+        return self.rover
+
+
+class RoverCommandQueue:
+    """
+    Ordered command queue for one rover, drained by its own worker thread.
+
+    The worker applies at most max_rate batches per second. Everything that
+    queued up since the last apply is merged into one atomic state update
+    (ten forwards become one displacement), so bursts and retries cost one
+    write and one patch. The worker exits when the queue is empty and is
+    restarted by the next submit, so idle rovers hold no thread.
+    """
+
+    def __init__(self, rover_id, max_rate=ROVER_MAX_COMMAND_RATE, limit=ROVER_QUEUE_LIMIT):
+        self.rover_id = rover_id
+        self.interval = 1.0 / max_rate
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._running = False
+        self._next_slot = 0.0
+        self._latencies = deque(maxlen=512)
+        self.submitted = 0
+        self.applied = 0
+        self.batches = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def submit(self, commands):
+        """
+        Queue commands in order.
+
+        Returns:
+            CommandTicket: Resolved once all of them are applied, or None if
+            the queue is full.
+        """
+        ticket = CommandTicket()
+        now = time.monotonic()
+        with self._lock:
+            if len(self._pending) + len(commands) > self.limit:
+                self.rejected += len(commands)
+                return None
+            for i, command in enumerate(commands):
+                # Only the last command of a submit carries the ticket
+                self._pending.append((command, now, ticket if i == len(commands) - 1 else None))
+            self.submitted += len(commands)
+            if not self._running:
+                self._running = True
+                threading.Thread(target=self._run, name=f'rover-{self.rover_id}',
+                                 daemon=True).start()
+        return ticket
+
+    def _run(self):
+        try:
+            self._drain()
+        except BaseException:
+            # Never leave the queue marked running without a worker, or the
+            # rover's commands would pile up unapplied for good
+            with self._lock:
+                self._running = False
+            raise
+
+    def _drain(self):
+        while True:
+            delay = self._next_slot - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                batch = list(self._pending)
+                self._pending.clear()
+
+            failed = False
+            try:
+                rover = execute_commands(self.rover_id, [command for command, _, _ in batch])
+            except KeyError:
+                # Rover was deregistered while commands were queued
+                rover = None
+            except Exception as e:
+                # e.g. a corrupt rover record: drop this batch, keep the worker
+                print(f"❌ Commands for rover {self.rover_id} failed: {e!r}")
+                rover = None
+                failed = True
+            finally:
+                applied_at = time.monotonic()
+                self._next_slot = applied_at + self.interval
+
+                with self._lock:
+                    if failed:
+                        self.failed += len(batch)
+                    else:
+                        self.applied += len(batch)
+                    self.batches += 1
+                    self._latencies.extend(applied_at - enqueued for _, enqueued, _ in batch)
+                for _, _, ticket in batch:
+                    if ticket is not None:
+                        ticket.resolve(rover)
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            depth = len(self._pending)
+        def pct(q):
+            if not latencies:
+                return None
+            return round(1000 * latencies[min(int(len(latencies) * q), len(latencies) - 1)], 2)
+        return {
+            "queue_depth": depth,
+            "submitted": self.submitted,
+            "applied": self.applied,
+            "batches": self.batches,
+            "merged": self.applied + self.failed - self.batches,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "apply_latency_p50_ms": pct(0.5),
+            "apply_latency_p95_ms": pct(0.95),
+        }
+
+
+class CommandExecutor:
+    """Creates one RoverCommandQueue per rover on first use."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues = {}
+
+    def queue(self, rover_id):
+        with self._lock:
+            if rover_id not in self._queues:
+                self._queues[rover_id] = RoverCommandQueue(rover_id)
+            return self._queues[rover_id]
+
+    def submit(self, rover_id, commands):
+        return self.queue(rover_id).submit(commands)
+
+    def discard(self, rover_id):
+        """Drop a deregistered rover's queue (its worker finishes what it already took)."""
+        with self._lock:
+            self._queues.pop(rover_id, None)
+
+    def stats(self):
+        with self._lock:
+            queues = dict(self._queues)
+        return {rover_id: q.stats() for rover_id, q in queues.items()}
+
+
+executor = CommandExecutor()
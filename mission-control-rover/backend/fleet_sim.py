@@ -0,0 +1,128 @@
+import os
+import time
+import numpy as np
+
+# Simulated fleet: SIM_ROVERS > 0 registers that many "sim-N" rovers at
+# startup and advances them SIM_TICK_HZ times a second
+SIM_ROVERS = int(os.environ.get("SIM_ROVERS", "0"))
+SIM_TICK_HZ = float(os.environ.get("SIM_TICK_HZ", "10"))
+
+METERS_PER_DEGREE = 111_320.0
+
+
+class FleetSimulator:
+    """
+    Fixed-timestep motion model for many rovers at once.
+
+    Position, heading, speed and battery live in NumPy arrays and each tick
+    advances the whole fleet with a handful of array operations: heading
+    random-walks, position integrates speed along heading, battery drains
+    with speed, and a rover whose battery hits zero stops and goes offline.
+    The results go through StateStore.update_rovers as one version per tick,
+    so they reach clients via the same status_patch path as real commands.
+    """
+
+    def __init__(self, store, count, tick_hz=SIM_TICK_HZ, prefix='sim-',
+                 origin=(37.7749, -122.4194), spread_m=2000.0, seed=0):
+        self.store = store
+        self.tick = 1.0 / tick_hz
+        self.rover_ids = [f"{prefix}{i}" for i in range(count)]
+        rng = np.random.default_rng(seed)
+        self._rng = rng
+        spread = spread_m / METERS_PER_DEGREE
+        self.lat = origin[0] + rng.uniform(-spread, spread, count)
+        self.lon = origin[1] + rng.uniform(-spread, spread, count)
+        self.heading = rng.uniform(0, 2 * np.pi, count)
+        self.speed = rng.uniform(0.5, 3.0, count)  # m/s
+        self.battery = rng.uniform(60, 100, count)  # percent
+        self._running = False
+        self.ticks = 0
+        self.overruns = 0
+        self.step_ms = 0.0
+        self.commit_ms = 0.0
+
+    def register(self):
+        """Register every simulated rover that isn't registered yet."""
+        for i, rover_id in enumerate(self.rover_ids):
+            if self.store.has('rovers', rover_id):
+                continue
+            self.store.register_rover(rover_id, {
+                "status": "online",
+                "moving": True,
+                "lat": float(self.lat[i]),
+                "lon": float(self.lon[i]),
+                "battery": round(float(self.battery[i]), 1),
+                "simulated": True,
+            })
+
+    def step(self, dt):
+        """Advance the fleet by dt seconds; returns the columns to write."""
+        alive = self.battery > 0
+        self.heading += self._rng.normal(0, 0.3 * np.sqrt(dt), len(self.heading))
+        distance = np.where(alive, self.speed * dt, 0.0) / METERS_PER_DEGREE
+        self.lat += distance * np.cos(self.heading)
+        self.lon += distance * np.sin(self.heading) / np.cos(np.radians(self.lat))
+        self.battery = np.maximum(self.battery - (0.01 + 0.02 * self.speed) * dt, 0.0)
+
+        moving = self.battery > 0
+        return {
+            "lat": self.lat.tolist(),
+            "lon": self.lon.tolist(),
+            # Rounded so battery only produces an op when the shown value moves
+            "battery": np.round(self.battery, 1).tolist(),
+            "moving": moving.tolist(),
+            "status": np.where(moving, "online", "offline").tolist(),
+        }
+
+    def advance(self):
+        """One tick: step the model and commit it to the store."""
+        started = time.perf_counter()
+        columns = self.step(self.tick)
+        stepped = time.perf_counter()
+        self.store.update_rovers(self.rover_ids, columns)
+        done = time.perf_counter()
+        self.step_ms = 1000 * (stepped - started)
+        self.commit_ms = 1000 * (done - stepped)
+        self.ticks += 1
+
+    def run(self, sleep=time.sleep):
+        """Tick at the fixed rate until stop(); a late tick is counted, not caught up."""
+        self._running = True
+        next_tick = time.monotonic()
+        while self._running:
+            self.advance()
+            next_tick += self.tick
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                sleep(delay)
+            else:
+                self.overruns += 1
+                next_tick = time.monotonic()
+
+    def stop(self):
+        self._running = False
+
+    def stats(self):
+        return {
+            "rovers": len(self.rover_ids),
+            "tick_hz": round(1.0 / self.tick, 2),
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "step_ms": round(self.step_ms, 2),
+            "commit_ms": round(self.commit_ms, 2),
+        }
+
+
+simulator = None
+
+
+def start_simulation(socketio, store, count=SIM_ROVERS):
+    """Register and start the simulated fleet as a background task (no-op for count 0)."""
+    global simulator
+    if count <= 0 or simulator is not None:
+        return simulator
+    simulator = FleetSimulator(store, count)
+    simulator.register()
+    print(f"🛰️  Simulating {count} rovers at {SIM_TICK_HZ:g} Hz")
+    socketio.start_background_task(simulator.run, sleep=socketio.sleep)
+    return simulator
@@ -0,0 +1,104 @@
+import mmap
+import os
+import tempfile
+import threading
+from collections import deque, namedtuple
+
+# One recorded frame: sequence number, wall-clock capture time, absolute
+# byte position in the ring (ever-increasing) and JPEG length
+RingEntry = namedtuple('RingEntry', ['seq', 'timestamp', 'position', 'length'])
+
+
+class FrameRing:
+    """
+    Fixed-size memory-mapped ring of encoded JPEG frames with timestamps.
+
+    Frames are stored back to back in a file-backed mmap; a frame that does
+    not fit before the end of the buffer wraps to offset 0. Positions are
+    absolute byte counts, so an entry is still intact as long as the write
+    head has not moved more than `capacity` bytes past it. Entries older
+    than max_age seconds are dropped from the index as new frames arrive.
+    """
+
+    def __init__(self, name, capacity, max_age=60.0, directory=None):
+        self.name = name
+        self.capacity = capacity
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._index = deque()
+        self._head = 0
+
+        fd, self.path = tempfile.mkstemp(prefix=f'ring-{name}-', suffix='.mjpeg', dir=directory)
+        try:
+            os.ftruncate(fd, capacity)
+            self._mmap = mmap.mmap(fd, capacity)
+        finally:
+            os.close(fd)
+        # The mapping keeps the data reachable; nothing else should open the file
+        os.unlink(self.path)
+        self._view = memoryview(self._mmap)
+
+    def append(self, seq, timestamp, jpeg):
+        length = len(jpeg)
+        if length > self.capacity:
+            return
+        with self._lock:
+            offset = self._head % self.capacity
+            if offset + length > self.capacity:
+                self._head += self.capacity - offset
+                offset = 0
+            self._view[offset:offset + length] = jpeg
+            self._index.append(RingEntry(seq, timestamp, self._head, length))
+            self._head += length
+
+            while self._index and (
+                    not self._intact(self._index[0])
+                    or timestamp - self._index[0].timestamp > self.max_age):
+                self._index.popleft()
+
+    def _intact(self, entry):
+        return self._head - entry.position <= self.capacity
+
+    def entries(self, start=None, end=None):
+        """Recorded frames with start <= timestamp <= end, oldest first."""
+        with self._lock:
+            return [
+                e for e in self._index
+                if (start is None or e.timestamp >= start)
+                and (end is None or e.timestamp <= end)
+            ]
+
+    def view(self, entry):
+        """
+        Zero-copy memoryview of a frame, or None if it has been overwritten.
+
+        The view aliases the ring, so callers that hold on to it must check
+        intact(entry) again after they are done reading.
+        """
+        if not self.intact(entry):
+            return None
+        offset = entry.position % self.capacity
+        return self._view[offset:offset + entry.length]
+
+    def intact(self, entry):
+        with self._lock:
+            return self._intact(entry)
+
+    def read(self, entry):
+        """Copy a frame out of the ring, or None if it was overwritten meanwhile."""
+        view = self.view(entry)
+        if view is None:
+            return None
+        data = bytes(view)
+        return data if self.intact(entry) else None
+
+    def stats(self):
+        with self._lock:
+            oldest = self._index[0].timestamp if self._index else None
+            newest = self._index[-1].timestamp if self._index else None
+            return {
+                "frames": len(self._index),
+                "capacity_bytes": self.capacity,
+                "oldest": oldest,
+                "newest": newest,
+            }
@@ -0,0 +1,345 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+import numpy as np
+from state_store import state
+from spatial_index import RoverLocator, parse_location
+from path_planner import path_planner
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # optional: greedy assignment is used without it
+    linear_sum_assignment = None
+
+# Scheduler: how often pending missions are matched to idle rovers, and the
+# most missions considered per round
+MISSION_SCHEDULE_INTERVAL = float(os.environ.get("MISSION_SCHEDULE_INTERVAL", "1.0"))
+MISSION_BATCH_SIZE = int(os.environ.get("MISSION_BATCH_SIZE", "512"))
+# "optimal" (needs scipy) or "greedy"
+MISSION_ASSIGNMENT = os.environ.get("MISSION_ASSIGNMENT", "optimal")
+
+PRIORITY_RANK = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+METERS_PER_DEGREE = 111_320.0
+
+
+class Mission:
+    __slots__ = ('id', 'lat', 'lon', 'payload', 'priority', 'created_at',
+                 'state', 'rover_id', 'assigned_at', 'route')
+
+    def __init__(self, mission_id, lat, lon, payload, priority):
+        self.id = mission_id
+        self.lat = lat
+        self.lon = lon
+        self.payload = payload
+        self.priority = priority
+        self.created_at = time.time()
+        self.state = 'pending'
+        self.rover_id = None
+        self.assigned_at = None
+        self.route = None
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "lat": self.lat,
+            "lon": self.lon,
+            "payload": self.payload,
+            "priority": self.priority,
+            "state": self.state,
+            "rover_id": self.rover_id,
+            "created_at": self.created_at,
+            "assigned_at": self.assigned_at,
+            "route": self.route,
+        }
+
+
+class MissionQueue:
+    """
+    Pending missions ordered by priority, then age, plus assignment records.
+
+    Pending missions sit in a heap keyed (priority rank, submit order);
+    take() pops the most urgent ones for a scheduling round and requeue()
+    puts back any that round could not place, keeping their position.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._heap = []
+        self._missions = {}
+        self._order = itertools.count()
+        self._ids = itertools.count(1)
+
+    def submit(self, lat, lon, payload, priority):
+        # NaN would reach the cost matrix, the planner and the status JSON
+        position = parse_location({'lat': lat, 'lon': lon})
+        if position is None:
+            raise ValueError("lat/lon must be finite, within ±90/±180")
+        with self._lock:
+            mission = Mission(f"m-{next(self._ids)}", *position, payload, priority)
+            self._missions[mission.id] = mission
+            heapq.heappush(self._heap, (PRIORITY_RANK[priority], next(self._order), mission.id))
+            return mission
+
+    def get(self, mission_id):
+        return self._missions.get(mission_id)
+
+    def take(self, limit):
+        """Pop up to `limit` pending missions, most urgent first, as (key, mission)."""
+        taken = []
+        with self._lock:
+            while self._heap and len(taken) < limit:
+                key = heapq.heappop(self._heap)
+                mission = self._missions.get(key[2])
+                if mission is not None and mission.state == 'pending':
+                    taken.append((key, mission))
+        return taken
+
+    def requeue(self, taken):
+        with self._lock:
+            for key, mission in taken:
+                if mission.state == 'pending':
+                    heapq.heappush(self._heap, key)
+
+    def release(self, mission):
+        """Put an assigned mission back in the queue (its rover went away)."""
+        with self._lock:
+            mission.state = 'pending'
+            mission.rover_id = None
+            mission.assigned_at = None
+            mission.route = None
+            heapq.heappush(self._heap, (PRIORITY_RANK[mission.priority], next(self._order), mission.id))
+
+    def finish(self, mission_id, outcome='completed'):
+        """Mark a mission completed/cancelled; returns (mission, its rover_id), or None."""
+        with self._lock:
+            mission = self._missions.get(mission_id)
+            if mission is None or mission.state in ('completed', 'cancelled'):
+                return None
+            rover_id = mission.rover_id
+            mission.state = outcome
+            return mission, rover_id
+
+    def assigned(self):
+        with self._lock:
+            return [m for m in self._missions.values() if m.state == 'assigned']
+
+    def pending(self, limit=50):
+        with self._lock:
+            keys = heapq.nsmallest(limit, self._heap)
+            return [self._missions[k[2]] for k in keys
+                    if self._missions[k[2]].state == 'pending']
+
+    def counts(self):
+        with self._lock:
+            counts = {'pending': 0, 'assigned': 0, 'completed': 0, 'cancelled': 0}
+            for mission in self._missions.values():
+                counts[mission.state] += 1
+            return counts
+
+
+def cost_matrix(mission_lat, mission_lon, rover_lat, rover_lon):
+    """Missions x rovers equirectangular distances in meters."""
+    # Longitude scale taken at each mission's latitude: one cos per row
+    # instead of per cell, well within a meter at dispatch ranges
+    scale = METERS_PER_DEGREE * np.cos(np.radians(mission_lat))[:, None]
+    # In place throughout: at thousands x thousands every temporary is ~100 MB
+    dx = np.subtract.outer(mission_lon, rover_lon)
+    dx *= scale
+    np.square(dx, out=dx)
+    dy = np.subtract.outer(mission_lat, rover_lat)
+    dy *= METERS_PER_DEGREE
+    np.square(dy, out=dy)
+    dx += dy
+    return np.sqrt(dx, out=dx)
+
+
+def assign_greedy(costs):
+    """
+    Each mission (rows are in priority order) takes its nearest free rover.
+
+    Returns:
+        tuple: (mission_indices, rover_indices) arrays.
+    """
+    costs = costs.copy()
+    rows, cols = [], []
+    for row in range(min(costs.shape)):
+        col = int(np.argmin(costs[row]))
+        rows.append(row)
+        cols.append(col)
+        costs[:, col] = np.inf
+    return np.array(rows, dtype=int), np.array(cols, dtype=int)
+
+
+def assign_optimal(costs):
+    """Minimum total distance matching (Hungarian / LAPJV via scipy)."""
+    return linear_sum_assignment(costs)
+
+
+def solve(costs, method=MISSION_ASSIGNMENT):
+    if method == 'optimal' and linear_sum_assignment is not None:
+        return assign_optimal(costs)
+    return assign_greedy(costs)
+
+
+class MissionScheduler:
+    """
+    Periodically matches pending missions to idle rovers in batches.
+
+    Each round takes the most urgent pending missions (no more than there
+    are idle rovers, so priority decides who waits), builds the
+    missions x rovers distance matrix with NumPy, solves the assignment
+    and plans a route for each match (after the assignments are committed,
+    outside the lock). Winners get a `mission` field on their rover record,
+    which also takes them out of the idle set; missions whose rover was
+    deregistered go back to the queue.
+    """
+
+    def __init__(self, queue, store, interval=MISSION_SCHEDULE_INTERVAL,
+                 batch_size=MISSION_BATCH_SIZE, method=MISSION_ASSIGNMENT, planner=path_planner):
+        self.queue = queue
+        self.store = store
+        self.planner = planner
+        self.interval = interval
+        self.batch_size = batch_size
+        self.method = method if linear_sum_assignment is not None else 'greedy'
+        self._lock = threading.Lock()
+        self._round_lock = threading.Lock()
+        self._started = False
+        self.rounds = 0
+        self.failed_rounds = 0
+        self.assigned_total = 0
+        self.last_round = None
+
+    def start(self, socketio):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        socketio.start_background_task(self._run, socketio.sleep)
+
+    def _run(self, sleep):
+        while True:
+            try:
+                self.schedule()
+            except Exception as e:
+                # One bad round must not stop scheduling for good
+                print(f"❌ Mission scheduling round failed: {e!r}")
+                self.failed_rounds += 1
+            sleep(self.interval)
+
+    def idle_rovers(self):
+        """(ids, lat, lon) of rovers that are online, stopped and unassigned."""
+        ids, lats, lons = [], [], []
+        for rover_id in self.store.rover_ids():
+            record = self.store.record(rover_id)
+            if record is None or not RoverLocator.is_idle(record):
+                continue
+            ids.append(rover_id)
+            lats.append(record.lat)
+            lons.append(record.lon)
+        return ids, np.array(lats), np.array(lons)
+
+    def schedule(self):
+        """Run one scheduling round; returns its stats."""
+        # Rounds never overlap, but only the assignment itself holds
+        # self._lock: routes are planned after it is released, so
+        # complete/cancel are not held up behind a batch of searches
+        with self._round_lock:
+            started = time.perf_counter()
+            with self._lock:
+                self._recover_orphans()
+                rover_ids, rover_lat, rover_lon = self.idle_rovers()
+                taken = self.queue.take(min(self.batch_size, len(rover_ids))) if rover_ids else []
+                assigned = []
+                distances = []
+                legs = []
+                if taken:
+                    try:
+                        missions = [mission for _, mission in taken]
+                        costs = cost_matrix(np.array([m.lat for m in missions]),
+                                            np.array([m.lon for m in missions]),
+                                            rover_lat, rover_lon)
+                        rows, cols = solve(costs, self.method)
+                        now = time.time()
+                        for row, col in zip(rows.tolist(), cols.tolist()):
+                            mission = missions[row]
+                            mission.state = 'assigned'
+                            mission.rover_id = rover_ids[col]
+                            mission.assigned_at = now
+                            mission.route = None
+                            assigned.append(mission)
+                            distances.append(float(costs[row, col]))
+                            legs.append((mission, mission.rover_id,
+                                         (float(rover_lat[col]), float(rover_lon[col]))))
+                    finally:
+                        # Unassigned missions (or all of them, if the round
+                        # failed) go back on the heap
+                        self.queue.requeue(taken)
+                    if assigned:
+                        self.store.update_rovers([m.rover_id for m in assigned],
+                                                 {'mission': [m.id for m in assigned]})
+                self._publish()
+            assign_ms = 1000 * (time.perf_counter() - started)
+
+            # Waypoints from each rover to its target (cached by cell pair)
+            for mission, rover_id, start in legs:
+                route = self.planner.route(start, (mission.lat, mission.lon))
+                with self._lock:
+                    # Skip missions completed, cancelled or reassigned meanwhile
+                    if mission.state == 'assigned' and mission.rover_id == rover_id:
+                        mission.route = route
+
+            self.rounds += 1
+            self.assigned_total += len(assigned)
+            self.last_round = {
+                "missions": len(taken),
+                "idle_rovers": len(rover_ids),
+                "assigned": len(assigned),
+                "mean_distance_m": round(float(np.mean(distances)), 1) if distances else None,
+                "assign_ms": round(assign_ms, 2),
+                "schedule_ms": round(1000 * (time.perf_counter() - started), 2),
+            }
+            return self.last_round
+
+    def _recover_orphans(self):
+        for mission in self.queue.assigned():
+            if self.store.record(mission.rover_id) is None:
+                self.queue.release(mission)
+
+    def complete(self, mission_id, outcome='completed'):
+        """Finish a mission and free its rover; returns the mission or None."""
+        with self._lock:
+            finished = self.queue.finish(mission_id, outcome)
+            if finished is None:
+                return None
+            mission, rover_id = finished
+            if rover_id is not None:
+                self.store.update_rovers([rover_id], {'mission': [None]})
+            self._publish()
+            return mission
+
+    def _publish(self):
+        counts = self.queue.counts()
+        self.store.update_global(lambda current: {
+            'missions': counts,
+            'mission_state': 'active' if counts['pending'] or counts['assigned']
+            else ('completed' if counts['completed'] else current['mission_state']),
+        })
+
+    def stats(self):
+        return {
+            "method": self.method,
+            "interval_s": self.interval,
+            "batch_size": self.batch_size,
+            "rounds": self.rounds,
+            "failed_rounds": self.failed_rounds,
+            "assigned_total": self.assigned_total,
+            "last_round": self.last_round,
+            "missions": self.queue.counts(),
+        }
+
+
+missions = MissionQueue()
+mission_scheduler = MissionScheduler(missions, state)
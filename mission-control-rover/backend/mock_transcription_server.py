@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the WisprFlow transcription API.
+
+Accepts POST /v1/audio/transcriptions and answers {"text": ...}, with
+injectable latency, error responses and dropped connections, so the
+transcription client's retries, deadlines and circuit breaker can be
+exercised without the real service.
+
+Usage:
+    python mock_transcription_server.py --port 8765
+    python mock_transcription_server.py --latency 2 --error-rate 0.3 --drop-rate 0.1
+
+Then point the backend at it:
+    WISPRFLOW_API_KEY=test WISPRFLOW_API_URL=http://127.0.0.1:8765/v1/audio/transcriptions python app.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Faults:
+    """Behaviour knobs; change them while the server runs."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 drop_rate=0.0, text="Help! Help! We need assistance urgently!"):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+        self.text = text
+        self.requests = 0
+        self.connections = 0
+
+
+def make_handler(faults):
+    class TranscriptionHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is visible
+
+        def setup(self):
+            super().setup()
+            faults.connections += 1
+
+        def do_POST(self):
+            faults.requests += 1
+            length = int(self.headers.get('Content-Length', 0))
+            self.rfile.read(length)
+
+            delay = faults.latency + random.uniform(0, faults.jitter)
+            if delay:
+                time.sleep(delay)
+            if random.random() < faults.drop_rate:
+                self.close_connection = True
+                self.connection.close()
+                return
+            if random.random() < faults.error_rate:
+                self._reply(faults.error_status, {"error": "injected failure"})
+                return
+            self._reply(200, {"text": faults.text, "duration": 5.0, "language": "en"})
+
+        def _reply(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            try:
+                self.end_headers()
+                self.wfile.write(payload)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client timed out and hung up first
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return TranscriptionHandler
+
+
+def start_server(port=0, faults=None):
+    """Start in a background thread; returns (server, faults, url)."""
+    faults = faults or Faults()
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(faults))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/audio/transcriptions"
+    return server, faults, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in WisprFlow transcription server")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random latency, seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction answered with --status")
+    parser.add_argument('--status', type=int, default=503)
+    parser.add_argument('--drop-rate', type=float, default=0.0, help="fraction of connections dropped")
+    args = parser.parse_args()
+
+    server, faults, url = start_server(args.port, Faults(args.latency, args.jitter, args.error_rate,
+                                                         args.status, args.drop_rate))
+    print("=" * 70)
+    print("🎙️  Stand-in Transcription Server")
+    print("=" * 70)
+    print(f"   {url}")
+    print(f"   latency {args.latency}s (+{args.jitter}s), errors {args.error_rate:.0%} "
+          f"(HTTP {args.status}), drops {args.drop_rate:.0%}")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"   {faults.requests} requests over {faults.connections} connections")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
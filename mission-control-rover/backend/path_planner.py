@@ -0,0 +1,395 @@
+import heapq
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+# Occupancy grid to plan over: a .npy array (nonzero = blocked) or an image
+# (dark pixels = blocked), its south-west corner and the cell size in meters.
+# Without PATH_GRID routes are straight lines.
+PATH_GRID = os.environ.get("PATH_GRID", "")
+PATH_GRID_ORIGIN = os.environ.get("PATH_GRID_ORIGIN", "0,0")
+PATH_GRID_CELL_M = float(os.environ.get("PATH_GRID_CELL_M", "1.0"))
+PATH_CACHE_SIZE = int(os.environ.get("PATH_CACHE_SIZE", "1024"))
+
+METERS_PER_DEGREE = 111_320.0
+SQRT2 = math.sqrt(2)
+
+
+def octile(x1, y1, x2, y2):
+    dx = abs(x1 - x2)
+    dy = abs(y1 - y2)
+    return (SQRT2 - 1) * min(dx, dy) + max(dx, dy)
+
+
+class OccupancyGrid:
+    """
+    Blocked/free cells anchored to lat/lon.
+
+    Row 0 is the southern edge and column 0 the western edge. Cells are
+    stored with a one-cell blocked border so neighbour lookups never need
+    bounds checks; (x, y) coordinates below are in that padded frame.
+    """
+
+    def __init__(self, blocked, origin=(0.0, 0.0), cell_m=1.0):
+        blocked = np.asarray(blocked, dtype=bool)
+        self.rows, self.cols = blocked.shape
+        self.origin_lat, self.origin_lon = origin
+        self.cell_m = cell_m
+        self.lat_step = cell_m / METERS_PER_DEGREE
+        self.lon_step = cell_m / (METERS_PER_DEGREE * math.cos(math.radians(self.origin_lat)))
+        free = np.zeros((self.rows + 2, self.cols + 2), dtype=bool)
+        free[1:-1, 1:-1] = ~blocked
+        self.free = free
+        self.width = self.cols + 2
+
+    @classmethod
+    def load(cls, path, origin=(0.0, 0.0), cell_m=1.0):
+        if path.endswith('.npy'):
+            blocked = np.load(path) != 0
+        else:
+            import cv2
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                raise ValueError(f"Cannot read occupancy grid image {path!r}")
+            # Image row 0 is the top (north); grid row 0 is the south edge
+            blocked = image[::-1] < 128
+        return cls(blocked, origin, cell_m)
+
+    def cell(self, lat, lon):
+        """Padded (x, y) of the cell containing lat/lon, or None outside the grid."""
+        col = int(math.floor((lon - self.origin_lon) / self.lon_step))
+        row = int(math.floor((lat - self.origin_lat) / self.lat_step))
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return None
+        return col + 1, row + 1
+
+    def position(self, x, y):
+        """lat/lon of a padded cell's center."""
+        return (self.origin_lat + (y - 0.5) * self.lat_step,
+                self.origin_lon + (x - 0.5) * self.lon_step)
+
+
+def _next_event(event, axis, forward):
+    """Index of the nearest event at-or-after (forward) / at-or-before each cell along axis."""
+    n = event.shape[axis]
+    shape = [1, 1]
+    shape[axis] = n
+    idx = np.arange(n, dtype=np.int32).reshape(shape)
+    if forward:
+        marked = np.where(event, idx, n).astype(np.int32)
+        flipped = np.flip(marked, axis)
+        return np.flip(np.minimum.accumulate(flipped, axis=axis), axis)
+    marked = np.where(event, idx, -1).astype(np.int32)
+    return np.maximum.accumulate(marked, axis=axis)
+
+
+class JumpPointSearch:
+    """
+    Jump point search over an OccupancyGrid (8-connected, no corner cutting).
+
+    Straight-line jumps are precomputed once per grid (the JPS+ idea): for
+    every cell and each of the four axis directions, a table holds where
+    the scan would stop, at a wall or at a cell with a forced neighbour.
+    The tables are built with a few NumPy passes, and at query time a
+    straight jump is one lookup. Diagonal jumps still step cell by cell,
+    checking the two straight jumps at each step through those tables.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        F = grid.free
+        up, down = np.roll(F, 1, axis=0), np.roll(F, -1, axis=0)        # F[y-1], F[y+1]
+        left, right = np.roll(F, 1, axis=1), np.roll(F, -1, axis=1)     # F[y, x-1], F[y, x+1]
+        up_left, up_right = np.roll(up, 1, axis=1), np.roll(up, -1, axis=1)
+        down_left, down_right = np.roll(down, 1, axis=1), np.roll(down, -1, axis=1)
+
+        # A cell is a jump point for a direction if entering it that way
+        # exposes a neighbour that the cell behind it could not reach
+        east = F & ((up & ~up_left) | (down & ~down_left))
+        west = F & ((up & ~up_right) | (down & ~down_right))
+        south = F & ((left & ~up_left) | (right & ~up_right))      # y increasing
+        north = F & ((left & ~down_left) | (right & ~down_right))  # y decreasing
+
+        self._free = memoryview(F.ravel())
+        self._east = memoryview(_next_event(~F | east, 1, True).ravel())
+        self._west = memoryview(_next_event(~F | west, 1, False).ravel())
+        self._south = memoryview(_next_event(~F | south, 0, True).ravel())
+        self._north = memoryview(_next_event(~F | north, 0, False).ravel())
+        self.width = grid.width
+
+    def _jump_x(self, x, y, dx, gx, gy):
+        """Jump point reached scanning the row from (x, y) in direction dx, or None."""
+        i = y * self.width + x
+        stop = self._east[i] if dx > 0 else self._west[i]
+        if y == gy and (x <= gx <= stop if dx > 0 else stop <= gx <= x):
+            return gx
+        return stop if self._free[y * self.width + stop] else None
+
+    def _jump_y(self, x, y, dy, gx, gy):
+        i = y * self.width + x
+        stop = self._south[i] if dy > 0 else self._north[i]
+        if x == gx and (y <= gy <= stop if dy > 0 else stop <= gy <= y):
+            return gy
+        return stop if self._free[stop * self.width + x] else None
+
+    def _jump(self, x, y, dx, dy, gx, gy):
+        if dy == 0:
+            jx = self._jump_x(x, y, dx, gx, gy)
+            return None if jx is None else (jx, y)
+        if dx == 0:
+            jy = self._jump_y(x, y, dy, gx, gy)
+            return None if jy is None else (x, jy)
+        # The two straight jumps are inlined: this loop is the hot path
+        free, width = self._free, self.width
+        along_x = self._east if dx > 0 else self._west
+        along_y = self._south if dy > 0 else self._north
+        step = dx + dy * width
+        i = y * width + x
+        while True:
+            if not free[i]:
+                return None
+            if x == gx and y == gy:
+                return x, y
+            stop = along_x[i + dx]
+            if free[y * width + stop] or (y == gy and (x < gx <= stop if dx > 0 else stop <= gx < x)):
+                return x, y
+            stop = along_y[i + dy * width]
+            if free[stop * width + x] or (x == gx and (y < gy <= stop if dy > 0 else stop <= gy < y)):
+                return x, y
+            if not (free[i + dx] and free[i + dy * width]):
+                return None
+            x += dx
+            y += dy
+            i += step
+
+    def _neighbours(self, x, y, px, py):
+        free, width = self._free, self.width
+        i = y * width + x
+        if px is None:
+            found = []
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                if free[i + dx + dy * width]:
+                    found.append((dx, dy))
+            for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+                if free[i + dx] and free[i + dy * width]:
+                    found.append((dx, dy))
+            return found
+
+        dx = (x > px) - (x < px)
+        dy = (y > py) - (y < py)
+        found = []
+        if dx and dy:
+            vertical = free[i + dy * width]
+            horizontal = free[i + dx]
+            if vertical:
+                found.append((0, dy))
+            if horizontal:
+                found.append((dx, 0))
+            if vertical and horizontal:
+                found.append((dx, dy))
+        elif dx:
+            ahead = free[i + dx]
+            below, above = free[i + width], free[i - width]
+            if ahead:
+                found.append((dx, 0))
+                if below:
+                    found.append((dx, 1))
+                if above:
+                    found.append((dx, -1))
+            if below:
+                found.append((0, 1))
+            if above:
+                found.append((0, -1))
+        else:
+            ahead = free[i + dy * width]
+            right, left = free[i + 1], free[i - 1]
+            if ahead:
+                found.append((0, dy))
+                if right:
+                    found.append((1, dy))
+                if left:
+                    found.append((-1, dy))
+            if right:
+                found.append((1, 0))
+            if left:
+                found.append((-1, 0))
+        return found
+
+    def search(self, start, goal):
+        """
+        Jump points from start to goal (padded cells), or None if unreachable.
+
+        Consecutive points are joined by straight or 45-degree segments.
+        """
+        free, width = self._free, self.width
+        (sx, sy), (gx, gy) = start, goal
+        if not free[sy * width + sx] or not free[gy * width + gx]:
+            return None
+        if start == goal:
+            return [start]
+
+        g = {start: 0.0}
+        parent = {start: None}
+        closed = set()
+        # (f, -g, node): among equal f prefer the node further along
+        heap = [(octile(sx, sy, gx, gy), 0.0, start)]
+        while heap:
+            _, neg_g, node = heapq.heappop(heap)
+            if node == goal:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                return path[::-1]
+            if node in closed:
+                continue
+            closed.add(node)
+            x, y = node
+            prev = parent[node]
+            px, py = prev if prev is not None else (None, None)
+            for dx, dy in self._neighbours(x, y, px, py):
+                jump = self._jump(x + dx, y + dy, dx, dy, gx, gy)
+                if jump is None or jump in closed:
+                    continue
+                cost = -neg_g + octile(x, y, jump[0], jump[1])
+                if cost < g.get(jump, math.inf):
+                    g[jump] = cost
+                    parent[jump] = node
+                    heapq.heappush(heap, (cost + octile(jump[0], jump[1], gx, gy), -cost, jump))
+        return None
+
+
+def astar(grid, start, goal):
+    """Plain 8-connected A* (no corner cutting); the reference JPS is checked against."""
+    free, width = memoryview(grid.free.ravel()), grid.width
+    (sx, sy), (gx, gy) = start, goal
+    if not free[sy * width + sx] or not free[gy * width + gx]:
+        return None
+    steps = [(1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+             (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2)]
+    g = {start: 0.0}
+    parent = {start: None}
+    closed = set()
+    heap = [(octile(sx, sy, gx, gy), 0.0, start)]
+    while heap:
+        _, neg_g, node = heapq.heappop(heap)
+        if node == goal:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = parent[node]
+            return path[::-1]
+        if node in closed:
+            continue
+        closed.add(node)
+        x, y = node
+        i = y * width + x
+        for dx, dy, step in steps:
+            if not free[i + dx + dy * width]:
+                continue
+            if dx and dy and not (free[i + dx] and free[i + dy * width]):
+                continue
+            nxt = (x + dx, y + dy)
+            cost = -neg_g + step
+            if nxt not in closed and cost < g.get(nxt, math.inf):
+                g[nxt] = cost
+                parent[nxt] = node
+                heapq.heappush(heap, (cost + octile(nxt[0], nxt[1], gx, gy), -cost, nxt))
+    return None
+
+
+def path_length(path):
+    return sum(octile(*a, *b) for a, b in zip(path, path[1:]))
+
+
+class PathPlanner:
+    """
+    Lat/lon routing over an occupancy grid with an LRU cache of routes.
+
+    Routes are cached by (start cell, goal cell), so missions dispatched
+    from and to the same places plan once. Without a grid every route is
+    the straight line from start to goal.
+    """
+
+    def __init__(self, grid=None, cache_size=PATH_CACHE_SIZE):
+        self.grid = grid
+        self.search = JumpPointSearch(grid) if grid is not None else None
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.plan_ms = []
+
+    @classmethod
+    def from_env(cls):
+        if not PATH_GRID:
+            return cls()
+        lat, lon = (float(v) for v in PATH_GRID_ORIGIN.split(','))
+        started = time.perf_counter()
+        planner = cls(OccupancyGrid.load(PATH_GRID, (lat, lon), PATH_GRID_CELL_M))
+        print(f"🗺️  Loaded occupancy grid {PATH_GRID} ({planner.grid.rows}x{planner.grid.cols}) "
+              f"in {time.perf_counter() - started:.2f}s")
+        return planner
+
+    def route(self, start, goal):
+        """
+        Waypoints from start to goal as [[lat, lon], ...].
+
+        Args:
+            start, goal: (lat, lon) tuples.
+
+        Returns:
+            list: Waypoints including both ends, or None if the goal is
+            unreachable (blocked, or either end outside the grid).
+        """
+        if self.grid is None:
+            return [list(start), list(goal)]
+        start_cell, goal_cell = self.grid.cell(*start), self.grid.cell(*goal)
+        if start_cell is None or goal_cell is None:
+            return None
+
+        key = (start_cell, goal_cell)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                cells = self._cache[key]
+                return self._waypoints(cells, start, goal) if cells is not None else None
+            self.misses += 1
+
+        started = time.perf_counter()
+        cells = self.search.search(start_cell, goal_cell)
+        elapsed = 1000 * (time.perf_counter() - started)
+
+        with self._lock:
+            self._cache[key] = cells
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            self.plan_ms.append(elapsed)
+            del self.plan_ms[:-256]
+        return self._waypoints(cells, start, goal) if cells is not None else None
+
+    def _waypoints(self, cells, start, goal):
+        # Exact endpoints, cell centers in between
+        middle = [list(self.grid.position(x, y)) for x, y in cells[1:-1]]
+        return [list(start)] + middle + [list(goal)]
+
+    def stats(self):
+        with self._lock:
+            times = sorted(self.plan_ms)
+        return {
+            "grid": None if self.grid is None else
+            {"rows": self.grid.rows, "cols": self.grid.cols, "cell_m": self.grid.cell_m},
+            "cached_routes": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "plan_p50_ms": round(times[len(times) // 2], 2) if times else None,
+            "plan_max_ms": round(times[-1], 2) if times else None,
+        }
+
+
+path_planner = PathPlanner.from_env()
@@ -0,0 +1,22 @@
+from flask import Blueprint, jsonify, send_file
+from audio_store import audio_store, sniff_type
+
+audio_bp = Blueprint('audio', __name__)
+
+# Blobs are content-addressed, so a URL's bytes never change
+AUDIO_MAX_AGE = 365 * 24 * 3600
+
+
+@audio_bp.route('/<audio_hash>', methods=['GET'])
+def get_audio(audio_hash):
+    path = audio_store.path(audio_hash)
+    if path is None:
+        return jsonify({"error": "Audio not found"}), 404
+
+    with open(path, 'rb') as f:
+        content_type = sniff_type(f.read(12))
+    # conditional=True answers Range requests (206) and If-None-Match (304)
+    response = send_file(path, mimetype=content_type, conditional=True,
+                         etag=audio_hash, max_age=AUDIO_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={AUDIO_MAX_AGE}, immutable'
+    return response
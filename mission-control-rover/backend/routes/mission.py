@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
-from mock_data import SYSTEM_STATE
-from flask_socketio import emit
-from extensions import socketio
+from state_store import state
+from mission_queue import PRIORITY_RANK, missions, mission_scheduler
+from path_planner import path_planner
+from spatial_index import parse_location
 
 mission_bp = Blueprint('mission', __name__)
 
@@ -13,14 +14,76 @@ def start_mission():
     if not all(k in data for k in ('lat', 'lon', 'payload', 'priority')):
         return jsonify({"error": "Missing fields"}), 400
 
-    # Update State
-    SYSTEM_STATE['lat'] = data['lat']
-    SYSTEM_STATE['lon'] = data['lon']
-    SYSTEM_STATE['payload'] = data['payload']
-    SYSTEM_STATE['priority'] = data['priority']
-    SYSTEM_STATE['mission_state'] = 'active'
-    
-    # Emit Update
-    socketio.emit('status_update', SYSTEM_STATE)
+    if data['priority'] not in PRIORITY_RANK:
+        return jsonify({"error": "Invalid priority"}), 400
+
+    try:
+        mission = missions.submit(data['lat'], data['lon'], data['payload'], data['priority'])
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid lat/lon"}), 400
+
+    # Latest mission stays on the dashboard (goes out in the next status_patch
+    # tick); the scheduler assigns a rover on its next round
+    state.update_global(lambda current: {
+        'lat': mission.lat,
+        'lon': mission.lon,
+        'payload': data['payload'],
+        'priority': data['priority'],
+        'mission_state': 'active',
+    })
     
-    return jsonify({"status": "Mission started", "data": SYSTEM_STATE})
+    response = {"status": "Mission started", "mission": mission.as_dict()}
+    # Only online, stopped, unassigned rovers are eligible; rovers come
+    # online by registering or via POST /rover/<rover_id>/heartbeat
+    idle = len(mission_scheduler.idle_rovers()[0])
+    response["idle_rovers"] = idle
+    if not idle:
+        response["note"] = ("No idle online rover; the mission stays pending until a "
+                            "rover registers or sends a heartbeat")
+    return jsonify(response), 201
+
+@mission_bp.route('/queue', methods=['GET'])
+def mission_queue():
+    # Scheduler stats and the most urgent pending missions
+    return jsonify({
+        "scheduler": mission_scheduler.stats(),
+        "pending": [m.as_dict() for m in missions.pending(request.args.get('limit', 50, type=int))],
+    })
+
+@mission_bp.route('/plan', methods=['POST'])
+def plan_route():
+    # Ad hoc route between two {"lat", "lon"} points
+    data = request.json or {}
+    start, goal = parse_location(data.get('start')), parse_location(data.get('goal'))
+    if start is None or goal is None:
+        return jsonify({"error": "start and goal need lat/lon"}), 400
+
+    route = path_planner.route(start, goal)
+    if route is None:
+        return jsonify({"error": "No route (blocked or outside the grid)"}), 422
+    return jsonify({"waypoints": route})
+
+@mission_bp.route('/planner', methods=['GET'])
+def planner_stats():
+    return jsonify(path_planner.stats())
+
+@mission_bp.route('/<mission_id>', methods=['GET'])
+def get_mission(mission_id):
+    mission = missions.get(mission_id)
+    if mission is None:
+        return jsonify({"error": "Unknown mission"}), 404
+    return jsonify(mission.as_dict())
+
+@mission_bp.route('/<mission_id>/complete', methods=['POST'])
+def complete_mission(mission_id):
+    mission = mission_scheduler.complete(mission_id)
+    if mission is None:
+        return jsonify({"error": "Unknown or finished mission"}), 404
+    return jsonify({"status": "Mission completed", "mission": mission.as_dict()})
+
+@mission_bp.route('/<mission_id>/cancel', methods=['POST'])
+def cancel_mission(mission_id):
+    mission = mission_scheduler.complete(mission_id, outcome='cancelled')
+    if mission is None:
+        return jsonify({"error": "Unknown or finished mission"}), 404
+    return jsonify({"status": "Mission cancelled", "mission": mission.as_dict()})
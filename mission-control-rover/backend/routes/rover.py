@@ -1,6 +1,9 @@
+import time
 from flask import Blueprint, request, jsonify
-from mock_data import SYSTEM_STATE
-from extensions import socketio
+from state_store import state
+from rover_commands import VALID_COMMANDS
+from command_queue import executor
+from rover_record import RoverRecord
 
 rover_bp = Blueprint('rover', __name__)
 
@@ -10,49 +13,82 @@ def control_rover():
     command = data.get('command')
     rover_id = data.get('rover_id')
     
-    if not rover_id or rover_id not in SYSTEM_STATE['rovers']:
+    if not rover_id or not state.has('rovers', rover_id):
         return jsonify({"error": "Invalid or missing rover_id"}), 400
 
-    if command not in ['forward', 'backward', 'left', 'right', 'stop']:
+    if command not in VALID_COMMANDS:
         return jsonify({"error": "Invalid command"}), 400
         
-    print(f"Executing command: {command} for {rover_id}")
+    print(f"Queueing command: {command} for {rover_id}")
     
-    # Get specific rover state
-    rover = SYSTEM_STATE['rovers'][rover_id]
-    
-    # Simulation Logic
-    step = 0.0001
-    is_moving = False
-    
-    if command == 'forward':
-        rover['lat'] += step
-        is_moving = True
-    elif command == 'backward':
-        rover['lat'] -= step
-        is_moving = True
-    elif command == 'left':
-        rover['lon'] -= step
-        is_moving = True
-    elif command == 'right':
-        rover['lon'] += step
-        is_moving = True
-    elif command == 'stop':
-        is_moving = False
-    
-    # Update movement state
-    rover['moving'] = is_moving
-    
-    # Log command
-    if is_moving:
-        socketio.emit('alert', {"type": "INFO", "level": "info", "message": f"{rover_id.upper()} ROVER \u2013 MOVING {command.upper()}"})
-    
-    # Emit global update (containing new rover states)
-    socketio.emit('status_update', SYSTEM_STATE)
+    # Applied in order by this rover's worker, merged with anything queued
+    # alongside it (goes out in the next status_patch tick)
+    if executor.submit(rover_id, [command]) is None:
+        return jsonify({"error": "Command queue full"}), 429
     
     return jsonify({
-        "status": "Command received", 
+        "status": "Command queued", 
         "rover_id": rover_id,
         "command": command, 
-        "new_position": {"lat": rover['lat'], "lon": rover['lon']}
-    })
+        "queue_depth": executor.queue(rover_id).stats()['queue_depth']
+    }), 202
+
+@rover_bp.route('/register', methods=['POST'])
+def register_rover():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    rover_id = data.pop('rover_id', None)
+    if not rover_id or not isinstance(rover_id, str):
+        return jsonify({"error": "Invalid or missing rover_id"}), 400
+
+    # Bad types would break every listener and command touching this rover
+    problem = RoverRecord.check(data)
+    if problem:
+        return jsonify({"error": problem}), 400
+
+    # A rover registering itself is up; only online rovers get missions
+    data.setdefault('status', 'online')
+    try:
+        rover = state.register_rover(rover_id, data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 409
+
+    print(f"Registered rover: {rover_id}")
+    return jsonify({"status": "Rover registered", "rover_id": rover_id, "rover": rover}), 201
+
+@rover_bp.route('/<rover_id>/heartbeat', methods=['POST'])
+def rover_heartbeat(rover_id):
+    # Rovers report in periodically: marks them online (unless they say
+    # otherwise) and refreshes last_seen, with optional position/battery
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    fields = {k: data[k] for k in ('lat', 'lon', 'battery', 'status') if k in data}
+    problem = RoverRecord.check(fields)
+    if problem:
+        return jsonify({"error": problem}), 400
+    fields.setdefault('status', 'online')
+    fields['last_seen'] = time.time()
+
+    try:
+        rover = state.update_rover(rover_id, lambda current: fields)
+    except KeyError:
+        return jsonify({"error": "Unknown rover_id"}), 404
+    return jsonify({"status": "Heartbeat received", "rover_id": rover_id, "rover": rover})
+
+@rover_bp.route('/<rover_id>', methods=['DELETE'])
+def deregister_rover(rover_id):
+    try:
+        state.deregister_rover(rover_id)
+    except KeyError:
+        return jsonify({"error": "Unknown rover_id"}), 404
+
+    executor.discard(rover_id)
+    print(f"Deregistered rover: {rover_id}")
+    return jsonify({"status": "Rover deregistered", "rover_id": rover_id})
+
+@rover_bp.route('/queues', methods=['GET'])
+def command_queues():
+    # Queue depth, merge counts and apply latency per rover
+    return jsonify(executor.stats())
@@ -1,8 +1,111 @@
-from flask import Blueprint, jsonify
-from mock_data import SYSTEM_STATE
+import gzip
+import json
+import threading
+import uuid
+from flask import Blueprint, Response, jsonify, request
+from state_store import state
+import fleet_sim
+import transcription
+from transcription_pool import transcription_pool
+from transcript_cache import transcript_cache
+from audio_store import audio_store
+from audio_upload import uploads
 
 status_bp = Blueprint('status', __name__)
 
+# Longest a ?since= long-poll may hold the request open
+MAX_LONG_POLL = 30.0
+# Below this size gzip costs more than it saves
+GZIP_MIN_BYTES = 1024
+
+# ETags embed a per-process id so versions from a previous run never match
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+
+class StatusCache:
+    """
+    Pre-encoded status snapshot, rebuilt only when the state version changes.
+
+    Holds the JSON body (and a gzipped copy, made on first demand) for the
+    latest version, so repeated polls of an unchanged state are a version
+    comparison plus a memory write.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._version = None
+        self._body = None
+        self._gzipped = None
+
+    def get(self, want_gzip=False):
+        """Return (version, body_bytes, is_gzipped) for the current state."""
+        with self._lock:
+            if self._version != self.store.version:
+                snapshot = self.store.snapshot()
+                self._body = json.dumps(snapshot, separators=(',', ':')).encode()
+                self._version = snapshot['version']
+                self._gzipped = None
+            if want_gzip and len(self._body) >= GZIP_MIN_BYTES:
+                if self._gzipped is None:
+                    self._gzipped = gzip.compress(self._body, compresslevel=6)
+                return self._version, self._gzipped, True
+            return self._version, self._body, False
+
+
+status_cache = StatusCache(state)
+
+
 @status_bp.route('/', methods=['GET'])
 def get_status():
-    return jsonify(SYSTEM_STATE)
+    # ?since=<version>: long-poll until the state moves past that version
+    since = request.args.get('since', type=int)
+    if since is not None:
+        timeout = min(request.args.get('timeout', MAX_LONG_POLL, type=float), MAX_LONG_POLL)
+        state.wait_for_change(since, max(timeout, 0))
+
+    want_gzip = 'gzip' in request.headers.get('Accept-Encoding', '')
+    version, body, gzipped = status_cache.get(want_gzip)
+    # Strong ETags must differ per content-coding; either one still
+    # identifies this version, so a client may revalidate with either
+    base_etag = f'{_BOOT_ID}-{version}'
+    etag = f'{base_etag}-gz' if gzipped else base_etag
+    headers = {
+        'Cache-Control': 'no-cache',
+        'Vary': 'Accept-Encoding',
+        'X-State-Version': str(version),
+    }
+
+    if request.if_none_match.contains(base_etag) or request.if_none_match.contains(f'{base_etag}-gz'):
+        return Response(status=304, headers={**headers, 'ETag': f'"{etag}"'})
+
+    response = Response(body, mimetype='application/json', headers=headers)
+    if gzipped:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(etag)
+    return response
+
+
+@status_bp.route('/sim', methods=['GET'])
+def simulation_stats():
+    if fleet_sim.simulator is None:
+        return jsonify({"error": "Simulation not running"}), 404
+    return jsonify(fleet_sim.simulator.stats())
+
+
+@status_bp.route('/transcription', methods=['GET'])
+def transcription_stats():
+    # Worker pool queue depth and transcription latency, transcript cache
+    # hit rates, plus upstream retry and circuit breaker counters when the
+    # real API is in use
+    stats = transcription_pool.stats()
+    stats["cache"] = transcript_cache.stats()
+    if transcription.client is not None:
+        stats["upstream"] = transcription.client.stats()
+    return jsonify(stats)
+
+
+@status_bp.route('/audio', methods=['GET'])
+def audio_stats():
+    # Blob store usage plus streamed uploads still being recorded
+    return jsonify({**audio_store.stats(), "uploads": uploads.stats()})
@@ -0,0 +1,83 @@
+import threading
+from state_store import state
+from status_broadcast import status_broadcaster
+
+VALID_COMMANDS = ['forward', 'backward', 'left', 'right', 'stop']
+
+# Simulation Logic
+STEP = 0.0001
+MOVES = {
+    'forward': ('lat', STEP),
+    'backward': ('lat', -STEP),
+    'left': ('lon', -STEP),
+    'right': ('lon', STEP),
+}
+
+def apply_command(rover, command):
+    """Fields to change on a rover record for one movement command."""
+    if command in MOVES:
+        field, delta = MOVES[command]
+        return {field: rover[field] + delta, 'moving': True}
+    return {'moving': False}
+
+def apply_commands(rover, commands):
+    """Fields to change for a run of commands applied in order."""
+    changes = {}
+    for command in commands:
+        changes.update(apply_command({**rover, **changes}, command))
+    return changes
+
+def execute_commands(rover_id, commands):
+    """
+    Apply commands to one rover as a single atomic update.
+
+    Returns:
+        dict: The rover's new record.
+    """
+    rover = state.update_rover(rover_id, lambda current: apply_commands(current, commands))
+    # Log command (repeats are summarized per rover by the broadcaster)
+    for command in commands:
+        if command in MOVES:
+            status_broadcaster.moving_alert(rover_id, command)
+    return rover
+
+
+class SequenceTracker:
+    """
+    Last accepted sequence number per (client, rover).
+
+    A command whose seq is not greater than the last one accepted from the
+    same client for the same rover is a retry or arrived out of order, and
+    is dropped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = {}
+
+    def is_new(self, client_id, rover_id, seq):
+        """True if seq is absent, or an int newer than the last recorded one."""
+        if seq is None:
+            return True
+        if not isinstance(seq, int) or isinstance(seq, bool):
+            return False
+        with self._lock:
+            last = self._last.get((client_id, rover_id))
+        return last is None or seq > last
+
+    def record(self, client_id, rover_id, seq):
+        """Mark seq as used, once its command has actually been queued."""
+        if seq is None:
+            return
+        key = (client_id, rover_id)
+        with self._lock:
+            if key not in self._last or seq > self._last[key]:
+                self._last[key] = seq
+
+    def forget(self, client_id):
+        with self._lock:
+            for key in [k for k in self._last if k[0] == client_id]:
+                del self._last[key]
+
+
+sequences = SequenceTracker()
@@ -0,0 +1,107 @@
+import math
+import time
+
+
+class RoverRecord:
+    """
+    Compact, immutable record for one rover.
+
+    The fields every rover has and every tick touches live in __slots__;
+    anything else (camera_url, per-deployment extras) goes in a small
+    `extra` dict that is left as None for rovers that have none. Records
+    must not be mutated once published (like the store's dicts, this is a
+    convention, not enforced): with_changes() returns a new one, which is
+    what lets the state store hand them to readers without locks.
+    """
+
+    __slots__ = ('status', 'moving', 'lat', 'lon', 'battery', 'last_seen', 'extra')
+
+    HOT_FIELDS = ('status', 'moving', 'lat', 'lon', 'battery', 'last_seen')
+    _HOT = frozenset(HOT_FIELDS)
+    DEFAULTS = {
+        'status': 'offline',
+        'moving': False,
+        'lat': 0.0,
+        'lon': 0.0,
+        'battery': 100,
+        'last_seen': None,
+    }
+    STATUSES = ('online', 'offline', 'error')
+
+    def __init__(self, fields=None):
+        fields = fields or {}
+        for name in self.HOT_FIELDS:
+            setattr(self, name, fields.get(name, self.DEFAULTS[name]))
+        extra = {k: v for k, v in fields.items() if k not in self.DEFAULTS}
+        self.extra = extra or None
+
+    @classmethod
+    def check(cls, fields):
+        """
+        Validate client-supplied hot fields before they enter the store.
+
+        Returns:
+            str: What is wrong, or None if the fields are usable.
+        """
+        def number(value):
+            return isinstance(value, (int, float)) and not isinstance(value, bool) \
+                and math.isfinite(value)
+
+        for name in ('lat', 'lon', 'battery'):
+            if name in fields and not number(fields[name]):
+                return f"{name} must be a number"
+        if fields.get('last_seen') is not None and not number(fields['last_seen']):
+            return "last_seen must be a number"
+        if 'status' in fields and fields['status'] not in cls.STATUSES:
+            return f"status must be one of {', '.join(cls.STATUSES)}"
+        if 'moving' in fields and not isinstance(fields['moving'], bool):
+            return "moving must be a boolean"
+        return None
+
+    @classmethod
+    def register(cls, fields=None):
+        """New record for a rover joining now (last_seen defaults to the current time)."""
+        fields = dict(fields or {})
+        fields.setdefault('last_seen', time.time())
+        return cls(fields)
+
+    def __contains__(self, name):
+        return name in self.DEFAULTS or (self.extra is not None and name in self.extra)
+
+    def get(self, name, default=None):
+        if name in self.DEFAULTS:
+            return getattr(self, name)
+        if self.extra is not None:
+            return self.extra.get(name, default)
+        return default
+
+    def with_changes(self, changes):
+        """Copy of this record with changes applied."""
+        # Spelled out field by field: this runs per rover per simulation tick
+        get = changes.get
+        record = RoverRecord.__new__(RoverRecord)
+        record.status = get('status', self.status)
+        record.moving = get('moving', self.moving)
+        record.lat = get('lat', self.lat)
+        record.lon = get('lon', self.lon)
+        record.battery = get('battery', self.battery)
+        record.last_seen = get('last_seen', self.last_seen)
+        record.extra = self.extra
+        if not self._HOT.issuperset(changes):
+            cold = {k: v for k, v in changes.items() if k not in self._HOT}
+            record.extra = {**(self.extra or {}), **cold}
+        return record
+
+    def as_dict(self):
+        """The REST/Socket.IO payload shape for this rover."""
+        view = {
+            'status': self.status,
+            'moving': self.moving,
+            'lat': self.lat,
+            'lon': self.lon,
+            'battery': self.battery,
+            'last_seen': self.last_seen,
+        }
+        if self.extra is not None:
+            view.update(self.extra)
+        return view
@@ -0,0 +1,195 @@
+import math
+import os
+import threading
+from state_store import state
+
+# How many candidate rovers a distress alert carries, and the grid cell size
+# (degrees; ~550 m of latitude at the default)
+DISPATCH_CANDIDATES = int(os.environ.get("DISPATCH_CANDIDATES", "3"))
+GRID_CELL_DEG = float(os.environ.get("GRID_CELL_DEG", "0.005"))
+
+METERS_PER_DEGREE = 111_320.0
+
+
+def parse_location(location):
+    """
+    (lat, lon) from a distress location, or None if it has no coordinates.
+
+    Accepts the User Panel's "lat, lon" string or a {"lat", "lon"} dict.
+    NaN, infinities, booleans and out-of-range values give None.
+    """
+    try:
+        if isinstance(location, dict):
+            if isinstance(location['lat'], bool) or isinstance(location['lon'], bool):
+                return None
+            lat, lon = float(location['lat']), float(location['lon'])
+        else:
+            lat, lon = (float(part) for part in str(location).split(','))
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
+def distance_m(lat1, lon1, lat2, lon2):
+    """Equirectangular distance in meters (accurate at dispatch ranges)."""
+    x = (lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = lat2 - lat1
+    return METERS_PER_DEGREE * math.hypot(x, y)
+
+
+class GridIndex:
+    """
+    Uniform lat/lon grid of points for k-nearest queries.
+
+    Points live in a dict of cells keyed by (row, col); moving a point is
+    two set operations, so the index can follow every position update.
+    A query scans rings of cells outward from the query's cell and stops
+    once no unscanned cell can hold anything closer than the k-th best.
+    """
+
+    def __init__(self, cell_deg=GRID_CELL_DEG):
+        self.cell_deg = cell_deg
+        self._cells = {}
+        self._points = {}
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, key):
+        return key in self._points
+
+    def _cell(self, lat, lon):
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    def insert(self, key, lat, lon):
+        """Add or move a point."""
+        cell = self._cell(lat, lon)
+        old = self._points.get(key)
+        if old is not None and old[2] != cell:
+            self._discard(key, old[2])
+        self._points[key] = (lat, lon, cell)
+        self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        old = self._points.pop(key, None)
+        if old is not None:
+            self._discard(key, old[2])
+
+    def _discard(self, key, cell):
+        bucket = self._cells[cell]
+        bucket.discard(key)
+        if not bucket:
+            del self._cells[cell]
+
+    def nearest(self, lat, lon, k):
+        """Up to k (distance_m, key, lat, lon) tuples, closest first."""
+        if k <= 0 or not self._points:
+            return []
+        row, col = self._cell(lat, lon)
+        # Meters per cell along the shorter (longitude) side bounds each ring
+        ring_m = self.cell_deg * METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6)
+        found = []
+        radius = 0
+        while (2 * radius + 1) ** 2 < len(self._cells):
+            for cell in self._ring(row, col, radius):
+                self._collect(found, cell, lat, lon)
+            # Anything outside this ring is at least radius cells away
+            if self._settled(found, k, radius * ring_m):
+                return found[:k]
+            radius += 1
+
+        # Rings now cover more cells than are occupied: visit the occupied
+        # cells not scanned yet, nearest ring first, with the same cutoff
+        rest = sorted((max(abs(r - row), abs(c - col)), (r, c)) for r, c in self._cells)
+        i = 0
+        while i < len(rest):
+            ring = rest[i][0]
+            while i < len(rest) and rest[i][0] == ring:
+                if ring >= radius:
+                    self._collect(found, rest[i][1], lat, lon)
+                i += 1
+            if self._settled(found, k, ring * ring_m):
+                break
+        found.sort()
+        return found[:k]
+
+    def _collect(self, found, cell, lat, lon):
+        for key in self._cells.get(cell, ()):
+            plat, plon, _ = self._points[key]
+            found.append((distance_m(lat, lon, plat, plon), key, plat, plon))
+
+    @staticmethod
+    def _settled(found, k, bound_m):
+        """Whether the k best so far are all within bound_m (so nothing farther can beat them)."""
+        if len(found) < k:
+            return False
+        found.sort()
+        return found[k - 1][0] <= bound_m
+
+    @staticmethod
+    def _ring(row, col, radius):
+        if radius == 0:
+            yield row, col
+            return
+        for c in range(col - radius, col + radius + 1):
+            yield row - radius, c
+            yield row + radius, c
+        for r in range(row - radius + 1, row + radius):
+            yield r, col - radius
+            yield r, col + radius
+
+
+class RoverLocator:
+    """
+    Grid index of idle rovers, kept current from state store changes.
+
+    A rover is idle when it is online, not moving and has no mission
+    assigned. The store listener only collects which rovers an op touched
+    and re-reads their records, so a simulation tick costs one index
+    update per rover, not per field.
+    """
+
+    TRACKED = {'lat', 'lon', 'status', 'moving', 'mission'}
+
+    def __init__(self, store, cell_deg=GRID_CELL_DEG):
+        self.store = store
+        self.grid = GridIndex(cell_deg)
+        self._lock = threading.Lock()
+        store.subscribe(self._on_change)
+        with self._lock:
+            for rover_id in store.rover_ids():
+                self._refresh(rover_id)
+
+    @staticmethod
+    def is_idle(record):
+        return record.status == 'online' and not record.moving \
+            and record.get('mission') is None
+
+    def _refresh(self, rover_id):
+        record = self.store.record(rover_id)
+        if record is not None and self.is_idle(record):
+            self.grid.insert(rover_id, record.lat, record.lon)
+        else:
+            self.grid.remove(rover_id)
+
+    def _on_change(self, version, ops):
+        touched = {op[0][1] for op in ops
+                   if op[0][0] == 'rovers' and (len(op[0]) == 2 or op[0][2] in self.TRACKED)}
+        if touched:
+            with self._lock:
+                for rover_id in touched:
+                    self._refresh(rover_id)
+
+    def nearest_idle(self, lat, lon, k=DISPATCH_CANDIDATES):
+        """Up to k idle rovers closest to (lat, lon), as alert-ready dicts."""
+        with self._lock:
+            found = self.grid.nearest(lat, lon, k)
+        return [
+            {"rover_id": key, "distance_m": round(dist, 1), "lat": plat, "lon": plon}
+            for dist, key, plat, plon in found
+        ]
+
+
+rover_locator = RoverLocator(state)
@@ -0,0 +1,243 @@
+import threading
+from collections import deque
+from mock_data import SYSTEM_STATE
+from rover_record import RoverRecord
+
+
+class StateStore:
+    """
+    Versioned, lock-striped system state with change patches.
+
+    Each rover has its own lock and the global mission fields share one,
+    so commands for different rovers never wait on each other. Records are
+    copy-on-write: a write builds a new dict and swaps it in, and published
+    dicts are never mutated, so readers take snapshots without locking and
+    serialization never blocks writers.
+
+    Every write bumps a monotonically increasing version and records the
+    change as a list of ops: [path, value] sets a value, [path] removes it,
+    where path is a list of keys such as ["rovers", "jetson", "lat"].
+    Listeners get (version, ops) for each change, and recent history is kept
+    so a client that fell a few versions behind can catch up with patches
+    instead of a full snapshot.
+
+    Rovers are stored as compact RoverRecords and can be registered and
+    deregistered at runtime; reads hand out the usual dict shape.
+    """
+
+    def __init__(self, initial, history=256):
+        initial = dict(initial)
+        self._rovers = {rid: RoverRecord(r) for rid, r in initial.pop('rovers', {}).items()}
+        self._rover_locks = {rid: threading.Lock() for rid in self._rovers}
+        self._global = initial
+        self._global_lock = threading.Lock()
+        # Serializes register/deregister (adding and removing stripes)
+        self._registry_lock = threading.Lock()
+        self._snapshot = None
+        # Orders versions/history/listeners; held only briefly after a write
+        self._version_lock = threading.Lock()
+        self._changed = threading.Condition(self._version_lock)
+        self._history = deque(maxlen=history)
+        self._listeners = []
+        self.version = 0
+
+    def subscribe(self, listener):
+        """Call listener(version, ops) after every change, in version order."""
+        self._listeners.append(listener)
+
+    # -- Reads (lock-free) ---------------------------------------------------
+
+    def snapshot(self):
+        """
+        Read-only view of the whole state plus its version.
+
+        The version is read first, so the content is at least that new;
+        patches are absolute sets, so re-applying a newer one is harmless.
+        The result is reused until the next write: do not mutate it.
+        """
+        version = self.version
+        cached = self._snapshot
+        if cached is not None and cached['version'] == version:
+            return cached
+        rovers = {rid: record.as_dict() for rid, record in self._rovers.copy().items()}
+        snapshot = {**self._global, "rovers": rovers, "version": version}
+        self._snapshot = snapshot
+        return snapshot
+
+    def rover(self, rover_id):
+        """Copy of one rover's record, or None if it doesn't exist."""
+        record = self._rovers.get(rover_id)
+        return record.as_dict() if record is not None else None
+
+    def record(self, rover_id):
+        """The rover's current RoverRecord (shared; do not mutate), or None."""
+        return self._rovers.get(rover_id)
+
+    def rover_ids(self):
+        return list(self._rovers)
+
+    def _root(self, path):
+        # Paths into one rover only need that rover, not a whole snapshot
+        if len(path) > 1 and path[0] == 'rovers':
+            record = self._rovers.get(path[1])
+            return {'rovers': {path[1]: record.as_dict()} if record is not None else {}}
+        return self.snapshot()
+
+    def has(self, *path):
+        node = self._root(path)
+        for key in path:
+            if not isinstance(node, dict) or key not in node:
+                return False
+            node = node[key]
+        return True
+
+    # -- Writes --------------------------------------------------------------
+
+    def _lock_for(self, rover_id):
+        return self._rover_locks[rover_id]
+
+    def _commit(self, ops):
+        with self._version_lock:
+            self.version += 1
+            version = self.version
+            self._history.append((version, ops))
+            for listener in self._listeners:
+                listener(version, ops)
+            self._changed.notify_all()
+        return version
+
+    def wait_for_change(self, since, timeout):
+        """Block until the version moves past `since` (or timeout); return the current version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != since, timeout)
+            return self.version
+
+    def update_rover(self, rover_id, fn):
+        """
+        Atomically read-modify-write one rover.
+
+        fn receives a copy of the rover's record and returns a dict of the
+        fields to change. Only fields whose value actually changes become ops.
+
+        Returns:
+            dict: The rover's new record (a copy).
+        """
+        with self._lock_for(rover_id):
+            current = self._rovers[rover_id]
+            changes = fn(current.as_dict()) or {}
+            ops = [[['rovers', rover_id, k], v] for k, v in changes.items()
+                   if k not in current or current.get(k) != v]
+            if ops:
+                current = current.with_changes(changes)
+                self._rovers[rover_id] = current
+                self._commit(ops)
+            return current.as_dict()
+
+    def update_global(self, fn):
+        """Atomically read-modify-write the non-rover (mission) fields; see update_rover."""
+        with self._global_lock:
+            current = self._global
+            changes = fn(dict(current)) or {}
+            ops = [[[k], v] for k, v in changes.items()
+                   if k not in current or current[k] != v]
+            if ops:
+                self._global = {**current, **changes}
+                self._commit(ops)
+            return dict(self._global)
+
+    def update_rovers(self, rover_ids, columns):
+        """
+        Write the same fields on many rovers as one version.
+
+        columns maps field name -> sequence of values aligned with rover_ids
+        (the shape a vectorized producer already has). Rovers that are no
+        longer registered are skipped; unchanged fields produce no ops.
+
+        Returns:
+            int: The new version (or the current one if nothing changed).
+        """
+        # Stripes are taken in rover id order; the commit happens under the
+        # locks so no other write to these rovers can be versioned in between
+        order = sorted(range(len(rover_ids)), key=rover_ids.__getitem__)
+        locks = []
+        for i in order:
+            lock = self._rover_locks.get(rover_ids[i])
+            if lock is not None:
+                lock.acquire()
+                locks.append(lock)
+        try:
+            fields = list(columns.items())
+            hot = all(name in RoverRecord.HOT_FIELDS for name in columns)
+            ops = []
+            for i in order:
+                rover_id = rover_ids[i]
+                current = self._rovers.get(rover_id)
+                if current is None:
+                    continue
+                read = current.__getattribute__ if hot else current.get
+                changes = {}
+                for name, values in fields:
+                    value = values[i]
+                    if read(name) != value:
+                        changes[name] = value
+                        ops.append([['rovers', rover_id, name], value])
+                if changes:
+                    self._rovers[rover_id] = current.with_changes(changes)
+            return self._commit(ops) if ops else self.version
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def register_rover(self, rover_id, fields=None):
+        """
+        Add a rover at runtime.
+
+        Raises:
+            ValueError: If a rover with this id already exists.
+
+        Returns:
+            dict: The new rover's record.
+        """
+        with self._registry_lock:
+            if rover_id in self._rovers:
+                raise ValueError(f"Rover {rover_id!r} is already registered")
+            record = RoverRecord.register(fields)
+            lock = threading.Lock()
+            with lock:
+                self._rover_locks[rover_id] = lock
+                self._rovers[rover_id] = record
+                self._commit([[['rovers', rover_id], record.as_dict()]])
+            return record.as_dict()
+
+    def deregister_rover(self, rover_id):
+        """
+        Remove a rover. Writers still queued on it get a KeyError.
+
+        Raises:
+            KeyError: If the rover doesn't exist.
+        """
+        with self._registry_lock:
+            with self._lock_for(rover_id):
+                del self._rovers[rover_id]
+                del self._rover_locks[rover_id]
+                self._commit([[['rovers', rover_id]]])
+
+    def patches_since(self, version):
+        """
+        Ops needed to bring a client at `version` up to date.
+
+        Returns:
+            tuple: (current_version, ops). ops is None if history no longer
+            reaches back that far and the client needs a full snapshot.
+        """
+        with self._version_lock:
+            if version == self.version:
+                return self.version, []
+            if version > self.version or not self._history \
+                    or self._history[0][0] > version + 1:
+                return self.version, None
+            return self.version, [op for v, ops in self._history if v > version for op in ops]
+
+
+# The one global system state; routes and handlers write through this
+state = StateStore(SYSTEM_STATE)
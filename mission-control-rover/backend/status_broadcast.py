@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+from collections import Counter
+from extensions import socketio
+from state_store import state
+
+# Emission limits: status patches go out at most STATUS_TICK_HZ times a
+# second, "MOVING" info alerts at most once per MOVE_ALERT_INTERVAL per rover
+STATUS_TICK_HZ = float(os.environ.get("STATUS_TICK_HZ", "20"))
+MOVE_ALERT_INTERVAL = float(os.environ.get("MOVE_ALERT_INTERVAL", "1.0"))
+
+
+class StatusBroadcaster:
+    """
+    Coalesces state changes and movement alerts into bounded-rate emissions.
+
+    State changes only mark the broadcaster dirty; a background task
+    flushes once per tick with every op since the last flush merged into a
+    single status_patch (later writes to a path replace earlier ones).
+    Movement alerts are counted per rover and sent as one summary per
+    interval, so holding an arrow key cannot flood the clients.
+    """
+
+    def __init__(self, socketio, store, tick_hz=STATUS_TICK_HZ,
+                 alert_interval=MOVE_ALERT_INTERVAL):
+        self.socketio = socketio
+        self.store = store
+        self.tick = 1.0 / tick_hz
+        self.alert_interval = alert_interval
+        self._lock = threading.Lock()
+        self._pending = {}
+        # Strict prefixes of pending paths, so leaf writes skip the subtree scan
+        self._prefixes = set()
+        self._base = store.version
+        self._version = store.version
+        self._moves = {}
+        self._last_alert = {}
+        self._started = False
+        self.emitted = 0
+        self.coalesced = 0
+        store.subscribe(self._on_change)
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.socketio.start_background_task(self._run)
+
+    def _on_change(self, version, ops):
+        with self._lock:
+            for op in ops:
+                path = tuple(op[0])
+                # A write to a path supersedes pending writes beneath it
+                if path in self._prefixes:
+                    for pending in [p for p in self._pending if p[:len(path)] == path]:
+                        del self._pending[pending]
+                        self.coalesced += 1
+                elif path in self._pending:
+                    self.coalesced += 1
+                self._pending[path] = op
+                if path[:-1] not in self._prefixes:
+                    self._prefixes.update(path[:i] for i in range(1, len(path)))
+            self._version = version
+
+    def moving_alert(self, rover_id, command):
+        with self._lock:
+            self._moves.setdefault(rover_id, Counter())[command] += 1
+
+    def _run(self):
+        while True:
+            started = time.monotonic()
+            self.flush()
+            self.socketio.sleep(max(self.tick - (time.monotonic() - started), 0))
+
+    def flush(self):
+        now = time.monotonic()
+        with self._lock:
+            patch = None
+            if self._pending:
+                patch = {"version": self._version, "base": self._base,
+                         "ops": list(self._pending.values())}
+                self._pending = {}
+                self._prefixes = set()
+                self._base = self._version
+            alerts = []
+            for rover_id, moves in list(self._moves.items()):
+                if now - self._last_alert.get(rover_id, float('-inf')) < self.alert_interval:
+                    continue
+                alerts.append(self._summarize(rover_id, moves))
+                self._last_alert[rover_id] = now
+                del self._moves[rover_id]
+
+        if patch is not None:
+            self.socketio.emit('status_patch', patch)
+            self.emitted += 1
+        for alert in alerts:
+            self.socketio.emit('alert', alert)
+
+    @staticmethod
+    def _summarize(rover_id, moves):
+        parts = [
+            command.upper() if count == 1 else f"{command.upper()} x{count}"
+            for command, count in moves.most_common()
+        ]
+        return {
+            "type": "INFO",
+            "level": "info",
+            "message": f"{rover_id.upper()} ROVER – MOVING {', '.join(parts)}",
+        }
+
+
+status_broadcaster = StatusBroadcaster(socketio, state)
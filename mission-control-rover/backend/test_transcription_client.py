@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the pooled WisprFlow client against the local stand-in server.
+Checks connection reuse, retries on upstream errors, the per-call deadline,
+and the circuit breaker opening, failing fast and recovering.
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from mock_transcription_server import start_server
+from transcription import (API_ERROR_TRANSCRIPT, UNAVAILABLE_TRANSCRIPT,
+                           CircuitBreaker, TranscriptionClient)
+
+AUDIO = b"\x1a\x45\xdf\xa3" + b"\x00" * 4096
+
+
+def make_client(url, **kwargs):
+    options = dict(api_key="test", pool_size=4, deadline=2.0, attempt_timeout=1.0,
+                   retries=2, backoff=0.05, breaker=CircuitBreaker(failures=3, reset_timeout=0.5))
+    options.update(kwargs)
+    return TranscriptionClient(url, **options)
+
+
+def check_pooled(url, faults):
+    client = make_client(url)
+    before = faults.connections
+    with ThreadPoolExecutor(4) as pool:
+        transcripts = list(pool.map(client.transcribe, [AUDIO] * 40))
+    assert all(t == faults.text for t in transcripts), transcripts
+    opened = faults.connections - before
+    assert opened <= 4, f"{opened} connections for 40 calls"
+    print(f"✅ 40 calls over {opened} connections")
+
+
+def check_retries(url, faults):
+    client = make_client(url)
+    faults.error_rate = 0.5
+    transcripts = [client.transcribe(AUDIO) for _ in range(20)]
+    faults.error_rate = 0.0
+    ok = sum(t == faults.text for t in transcripts)
+    assert ok >= 15, f"only {ok}/20 succeeded with retries"
+    print(f"✅ 50% upstream errors: {ok}/20 calls succeeded in {client.attempts} attempts")
+
+
+def check_client_error(url, faults):
+    client = make_client(url)
+    faults.error_rate, faults.error_status = 1.0, 400
+    transcript = client.transcribe(AUDIO)
+    faults.error_rate, faults.error_status = 0.0, 503
+    assert transcript == API_ERROR_TRANSCRIPT, transcript
+    assert client.attempts == 1, "a 400 should not be retried"
+    print("✅ HTTP 400 returned without retrying")
+
+
+def check_deadline(url, faults):
+    client = make_client(url, deadline=0.6, attempt_timeout=0.4)
+    faults.latency = 1.0
+    started = time.monotonic()
+    transcript = client.transcribe(AUDIO)
+    elapsed = time.monotonic() - started
+    faults.latency = 0.0
+    assert transcript == UNAVAILABLE_TRANSCRIPT, transcript
+    assert elapsed < 1.0, f"call took {elapsed:.2f}s past a 0.6s deadline"
+    print(f"✅ Slow upstream gave up after {elapsed:.2f}s (deadline 0.6s)")
+
+
+def check_breaker(url, faults):
+    client = make_client(url)
+    faults.error_rate = 1.0
+    for _ in range(3):
+        client.transcribe(AUDIO)
+    assert client.breaker.state == 'open', client.breaker.state
+
+    requests_before = faults.requests
+    started = time.monotonic()
+    transcript = client.transcribe(AUDIO)
+    elapsed = time.monotonic() - started
+    assert transcript == UNAVAILABLE_TRANSCRIPT
+    assert faults.requests == requests_before, "open breaker still called upstream"
+    print(f"✅ Breaker open: call failed fast in {1000 * elapsed:.2f} ms")
+
+    faults.error_rate = 0.0
+    time.sleep(0.6)
+    transcript = client.transcribe(AUDIO)
+    assert transcript == faults.text, transcript
+    assert client.breaker.state == 'closed', client.breaker.state
+    print("✅ Breaker closed again after a successful probe")
+
+
+def main():
+    print("=" * 70)
+    print("🧪 TRANSCRIPTION CLIENT TEST")
+    print("=" * 70)
+    server, faults, url = start_server()
+    print(f"   Stand-in server: {url}\n")
+
+    failed = False
+    for check in (check_pooled, check_retries, check_client_error, check_deadline, check_breaker):
+        try:
+            check(url, faults)
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {check.__name__}: {e}")
+    server.shutdown()
+
+    print("\n" + "=" * 70)
+    print("❌ FAILURES" if failed else "✅ ALL CHECKS PASSED")
+    print("=" * 70)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
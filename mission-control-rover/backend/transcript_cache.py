@@ -0,0 +1,231 @@
+import base64
+import binascii
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from transcription import transcribe_audio_wisprflow
+
+# In-memory LRU entries; the disk tier is off unless TRANSCRIPT_CACHE_DIR is set
+TRANSCRIPT_CACHE_SIZE = int(os.environ.get("TRANSCRIPT_CACHE_SIZE", "256"))
+TRANSCRIPT_CACHE_DIR = os.environ.get("TRANSCRIPT_CACHE_DIR", "")
+TRANSCRIPT_CACHE_TTL = float(os.environ.get("TRANSCRIPT_CACHE_TTL", str(7 * 24 * 3600)))
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.environ.get("TRANSCRIPT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+
+def audio_key(audio_data):
+    """
+    Content hash of the audio, so the same clip resent (or replayed in a
+    drill) maps to the same key however it arrived.
+
+    Base64 strings are hashed by their decoded bytes; anything that does
+    not decode (e.g. the demo's mock blob id) is hashed as its text.
+    """
+    if isinstance(audio_data, str):
+        try:
+            audio_data = base64.b64decode(audio_data, validate=True)
+        except (binascii.Error, ValueError):
+            audio_data = audio_data.encode()
+    elif not isinstance(audio_data, (bytes, bytearray, memoryview)):
+        audio_data = repr(audio_data).encode()
+    return hashlib.sha256(audio_data).hexdigest()
+
+
+def cacheable(transcript):
+    # Placeholders for failed or refused calls must not stick to the audio
+    return isinstance(transcript, str) and not transcript.startswith("[Transcription")
+
+
+class _Flight:
+    __slots__ = ('done', 'transcript')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.transcript = None
+
+
+class DiskTier:
+    """
+    One small JSON file per transcript under `directory`, named by audio
+    hash. Entries older than `ttl` are treated as missing and removed;
+    once the tier grows past `max_bytes` the least recently written
+    entries are evicted.
+    """
+
+    def __init__(self, directory, ttl=TRANSCRIPT_CACHE_TTL, max_bytes=TRANSCRIPT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _entries(self):
+        return [entry for entry in os.scandir(self.directory)
+                if entry.is_file() and entry.name.endswith('.json')]
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > self.ttl:
+                self._remove(path, stat.st_size)
+                return None
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)['transcript']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, transcript):
+        path = self._path(key)
+        payload = json.dumps({"transcript": transcript, "created": time.time()}).encode()
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            previous = os.stat(path).st_size if os.path.exists(path) else 0
+            with open(tmp, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️  Transcript cache write failed: {e}")
+            return
+        with self._lock:
+            self._size += len(payload) - previous
+            over = self._size > self.max_bytes
+        if over:
+            self._evict()
+
+    def _remove(self, path, size):
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._size -= size
+
+    def _evict(self):
+        """Drop expired entries, then the oldest until under 90% of max_bytes."""
+        now = time.time()
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl:
+                self._remove(entry.path, stat.st_size)
+            else:
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        entries.sort()
+        target = self.max_bytes * 0.9
+        for _, path, size in entries:
+            if self._size <= target:
+                break
+            self._remove(path, size)
+
+    def stats(self):
+        return {"dir": self.directory, "bytes": self._size, "max_bytes": self.max_bytes}
+
+
+class TranscriptCache:
+    """
+    Transcripts keyed by audio content hash, in front of the upstream call.
+
+    Lookups go memory LRU -> disk tier -> upstream. Concurrent requests for
+    the same audio share one upstream call (single flight): the first
+    caller transcribes, the rest wait for its result.
+    """
+
+    def __init__(self, transcribe=transcribe_audio_wisprflow, max_entries=TRANSCRIPT_CACHE_SIZE,
+                 disk=None):
+        self._transcribe = transcribe
+        self.max_entries = max_entries
+        self.disk = disk
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._inflight = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def lookup(self, key):
+        """Cached transcript for an audio key, or None. Never calls upstream."""
+        with self._lock:
+            transcript = self._memory.get(key)
+            if transcript is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return transcript
+        if self.disk is None:
+            return None
+        transcript = self.disk.get(key)
+        if transcript is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(key, transcript)
+        return transcript
+
+    def _remember(self, key, transcript):
+        with self._lock:
+            self._memory[key] = transcript
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def transcribe(self, audio_data):
+        """Drop-in for transcribe_audio_wisprflow, served from cache when possible."""
+        key = audio_key(audio_data)
+        transcript = self.lookup(key)
+        if transcript is not None:
+            return transcript
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            return flight.transcript
+
+        flight.transcript = "[Transcription unavailable]"
+        try:
+            transcript = self._transcribe(audio_data)
+            flight.transcript = transcript
+            if cacheable(transcript):
+                self._remember(key, transcript)
+                if self.disk is not None:
+                    self.disk.put(key, transcript)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+        return transcript
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._inflight),
+            }
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+transcript_cache = TranscriptCache(
+    disk=DiskTier(TRANSCRIPT_CACHE_DIR) if TRANSCRIPT_CACHE_DIR else None)
@@ -1,76 +1,214 @@
 import os
+import random
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 
 # WisprFlow Configuration
-WISPRFLOW_API_URL = "https://transcribe.wisprflow.ai/v1/audio/transcriptions"
+WISPRFLOW_API_URL = os.environ.get(
+    "WISPRFLOW_API_URL", "https://transcribe.wisprflow.ai/v1/audio/transcriptions")
 WISPRFLOW_API_KEY = os.environ.get("WISPRFLOW_API_KEY", "")
 USE_REAL_API = bool(WISPRFLOW_API_KEY)
 
+# Upstream call policy: a whole call (retries included) gets TRANSCRIBE_DEADLINE
+# seconds, each attempt at most TRANSCRIBE_ATTEMPT_TIMEOUT; after
+# BREAKER_FAILURES failed calls in a row the breaker opens for BREAKER_RESET
+TRANSCRIBE_DEADLINE = float(os.environ.get("TRANSCRIBE_DEADLINE", "20"))
+TRANSCRIBE_ATTEMPT_TIMEOUT = float(os.environ.get("TRANSCRIBE_ATTEMPT_TIMEOUT", "10"))
+TRANSCRIBE_RETRIES = int(os.environ.get("TRANSCRIBE_RETRIES", "2"))
+TRANSCRIBE_BACKOFF = float(os.environ.get("TRANSCRIBE_BACKOFF", "0.5"))
+BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", "5"))
+BREAKER_RESET = float(os.environ.get("BREAKER_RESET", "30"))
+# One keep-alive connection per transcription worker
+TRANSCRIBE_POOL_SIZE = int(os.environ.get("TRANSCRIBE_WORKERS", "4"))
+
+UNAVAILABLE_TRANSCRIPT = "[Transcription unavailable]"
+API_ERROR_TRANSCRIPT = "[Transcription failed - API error]"
+
+MOCK_TRANSCRIPTS = [
+    "We are trapped and need medical help urgently",
+    "Building collapsed, need rescue team",
+    "Injured person here, please send ambulance",
+    "Need water and food supplies",
+    "Fire spreading, evacuate immediately",
+    "Help! Help! We need assistance urgently!"
+]
+
+
+class UpstreamError(Exception):
+    """A failed attempt that is worth retrying (network error, timeout, 429/5xx)."""
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast while the upstream looks down.
+
+    closed:    calls go through; `failures` consecutive failed calls open it.
+    open:      calls are refused until `reset_timeout` has passed.
+    half_open: one probe call goes through; success closes the breaker,
+               failure opens it for another reset_timeout.
+    """
+
+    def __init__(self, failures=BREAKER_FAILURES, reset_timeout=BREAKER_RESET, clock=time.monotonic):
+        self.max_failures = failures
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'open' and self.clock() - self._opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+                self._probing = False
+            if self.state == 'closed':
+                return True
+            if self.state == 'half_open' and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == 'half_open' or self._failures >= self.max_failures:
+                if self.state != 'open':
+                    print(f"⚡ Transcription circuit open for {self.reset_timeout:g}s")
+                self.state = 'open'
+                self._opened_at = self.clock()
+                self._probing = False
+
+
+class TranscriptionClient:
+    """
+    WisprFlow client with a keep-alive connection pool, bounded retries
+    with jittered exponential backoff, a per-call deadline and a circuit
+    breaker. Never raises: failures come back as placeholder transcripts.
+    """
+
+    def __init__(self, url=WISPRFLOW_API_URL, api_key=WISPRFLOW_API_KEY,
+                 pool_size=TRANSCRIBE_POOL_SIZE, deadline=TRANSCRIBE_DEADLINE,
+                 attempt_timeout=TRANSCRIBE_ATTEMPT_TIMEOUT, retries=TRANSCRIBE_RETRIES,
+                 backoff=TRANSCRIBE_BACKOFF, breaker=None):
+        self.url = url
+        self.api_key = api_key
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Authorization'] = f'Bearer {api_key}'
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.attempts = 0
+        self.failures = 0
+
+    def transcribe(self, audio_data):
+        if not self.breaker.allow():
+            return UNAVAILABLE_TRANSCRIPT
+
+        with self._lock:
+            self.calls += 1
+        deadline = time.monotonic() + self.deadline
+        for attempt in range(self.retries + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            with self._lock:
+                self.attempts += 1
+            try:
+                transcript = self._attempt(audio_data, min(self.attempt_timeout, remaining))
+            except UpstreamError as e:
+                print(f"❌ Transcription attempt {attempt + 1} failed: {e}")
+                # Full jitter, never sleeping past the deadline
+                delay = random.uniform(0, self.backoff * (2 ** attempt))
+                if attempt < self.retries and time.monotonic() + delay < deadline:
+                    time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return transcript
+
+        with self._lock:
+            self.failures += 1
+        self.breaker.record_failure()
+        return UNAVAILABLE_TRANSCRIPT
+
+    def _attempt(self, audio_data, timeout):
+        try:
+            response = self.session.post(
+                self.url,
+                files={'file': ('audio.webm', audio_data, 'audio/webm')},
+                data={
+                    'model': 'whisper-large-v3',
+                    'language': 'en',
+                    'response_format': 'json'
+                },
+                timeout=timeout,
+            )
+        except requests.RequestException as e:
+            raise UpstreamError(e) from e
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise UpstreamError(f"HTTP {response.status_code}")
+        if response.status_code != 200:
+            # The upstream is up but rejected this request: retrying won't help
+            print(f"❌ WisprFlow API error: {response.status_code}")
+            return API_ERROR_TRANSCRIPT
+        try:
+            return response.json().get('text', UNAVAILABLE_TRANSCRIPT)
+        except ValueError as e:
+            raise UpstreamError(f"Bad response body: {e}") from e
+
+    def stats(self):
+        return {
+            "url": self.url,
+            "breaker": self.breaker.state,
+            "breaker_rejected": self.breaker.rejected,
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "failures": self.failures,
+        }
+
+
+client = TranscriptionClient() if USE_REAL_API else None
+
 def transcribe_audio_wisprflow(audio_data):
     """
     Send audio to WisprFlow for transcription.
     Uses real API if WISPRFLOW_API_KEY is set, otherwise returns mock transcript.
-    
+
     Args:
         audio_data: Audio blob/metadata from client (base64 encoded or file path)
-    
+
     Returns:
         str: Transcript of the audio
     """
-    
+
     # Option 1: Real WisprFlow API integration
-    if USE_REAL_API:
-        try:
-            # Prepare request
-            files = {
-                'file': ('audio.webm', audio_data, 'audio/webm')
-            }
-            
-            headers = {
-                'Authorization': f'Bearer {WISPRFLOW_API_KEY}'
-            }
-            
-            data = {
-                'model': 'whisper-large-v3',
-                'language': 'en',
-                'response_format': 'json'
-            }
-            
-            print(f"🎙️  Calling WisprFlow API for transcription...")
-            
-            response = requests.post(
-                WISPRFLOW_API_URL,
-                files=files,
-                headers=headers,
-                data=data,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                transcript = result.get('text', '[Transcription unavailable]')
-                print(f"✅ Transcript received: {transcript}")
-                return transcript
-            else:
-                print(f"❌ WisprFlow API error: {response.status_code}")
-                return "[Transcription failed - API error]"
-                
-        except Exception as e:
-            print(f"❌ Transcription error: {e}")
-            return "[Transcription unavailable]"
-    
+    if client is not None:
+        print(f"🎙️  Calling WisprFlow API for transcription...")
+        transcript = client.transcribe(audio_data)
+        print(f"📝 Transcript: {transcript}")
+        return transcript
+
     # Option 2: Mock for demo/hackathon (default)
     else:
-        import random
-        mock_transcripts = [
-            "We are trapped and need medical help urgently",
-            "Building collapsed, need rescue team",
-            "Injured person here, please send ambulance",
-            "Need water and food supplies",
-            "Fire spreading, evacuate immediately",
-            "Help! Help! We need assistance urgently!"
-        ]
-        
-        transcript = random.choice(mock_transcripts)
+        transcript = random.choice(MOCK_TRANSCRIPTS)
         print(f"📝 Using mock transcript: {transcript}")
         return transcript
@@ -0,0 +1,117 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from transcript_cache import transcript_cache
+
+# Concurrent upstream transcriptions, and how many may wait behind them
+# before new requests are turned away
+TRANSCRIBE_WORKERS = int(os.environ.get("TRANSCRIBE_WORKERS", "4"))
+TRANSCRIBE_QUEUE = int(os.environ.get("TRANSCRIBE_QUEUE", "32"))
+
+BUSY_TRANSCRIPT = "[Transcription unavailable - service busy]"
+
+
+class TranscriptionPool:
+    """
+    Bounded worker pool for transcriptions, off the Socket.IO handler threads.
+
+    submit() never blocks: the job goes on a bounded queue (or is rejected
+    when it is full) and the caller's callback runs on a worker thread with
+    the transcript once it is ready. Workers start on first submit.
+    """
+
+    def __init__(self, transcribe=transcript_cache.transcribe, workers=TRANSCRIBE_WORKERS,
+                 max_queue=TRANSCRIBE_QUEUE):
+        self.transcribe = transcribe
+        self.workers = workers
+        self._jobs = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._started = False
+        self._active = 0
+        self._latencies = deque(maxlen=512)
+        self._waits = deque(maxlen=512)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for i in range(self.workers):
+            threading.Thread(target=self._run, name=f'transcribe-{i}', daemon=True).start()
+
+    def submit(self, audio_data, callback):
+        """
+        Queue audio for transcription; callback(transcript) runs when done.
+
+        Returns:
+            bool: False if the queue is full (callback is not called).
+        """
+        self._start()
+        try:
+            self._jobs.put_nowait((audio_data, callback, time.monotonic()))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def _run(self):
+        while True:
+            audio_data, callback, queued_at = self._jobs.get()
+            started = time.monotonic()
+            with self._lock:
+                self._active += 1
+                self._waits.append(started - queued_at)
+            try:
+                transcript = self.transcribe(audio_data)
+                failed = False
+            except Exception as e:
+                print(f"❌ Transcription worker error: {e}")
+                transcript = "[Transcription unavailable]"
+                failed = True
+            finished = time.monotonic()
+            with self._lock:
+                self._active -= 1
+                self._latencies.append(finished - started)
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+            try:
+                callback(transcript)
+            except Exception as e:
+                print(f"❌ Transcription callback error: {e}")
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            waits = sorted(self._waits)
+            active = self._active
+        def pct(values, q):
+            if not values:
+                return None
+            return round(1000 * values[min(int(len(values) * q), len(values) - 1)], 1)
+        return {
+            "workers": self.workers,
+            "queue_depth": self._jobs.qsize(),
+            "in_flight": active,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "wait_p50_ms": pct(waits, 0.5),
+            "wait_p95_ms": pct(waits, 0.95),
+            "transcribe_p50_ms": pct(latencies, 0.5),
+            "transcribe_p95_ms": pct(latencies, 0.95),
+        }
+
+
+transcription_pool = TranscriptionPool()
@@ -1,25 +1,108 @@
+from flask import request
 from flask_socketio import SocketIO, emit
-from mock_data import SYSTEM_STATE
-from transcription import transcribe_audio_wisprflow
+from state_store import state
+from rover_commands import VALID_COMMANDS, sequences
+from command_queue import executor
+from status_broadcast import status_broadcaster
+from mission_queue import mission_scheduler
+from spatial_index import parse_location, rover_locator
+from transcription_pool import BUSY_TRANSCRIPT, transcription_pool
+from transcript_cache import audio_key, transcript_cache
+from audio_store import audio_store
+from audio_upload import UploadError, uploads
 from datetime import datetime
+import uuid
 
 def register_socketio_events(socketio):
+    # State changes go out as compact versioned patches, at most once per tick
+    status_broadcaster.start()
+    # Pending missions are matched to idle rovers in periodic batches
+    mission_scheduler.start(socketio)
+
     @socketio.on('connect')
     def handle_connect():
         print('✅ Client connected')
-        emit('status_update', SYSTEM_STATE)
+        emit('status_update', state.snapshot())
+
+    @socketio.on('status_sync')
+    def handle_status_sync(data):
+        """Client missed a patch: send what it lacks, or a full snapshot if history is gone"""
+        version = (data or {}).get('version', -1)
+        current, ops = state.patches_since(version) if isinstance(version, int) else (None, None)
+        if ops is None:
+            emit('status_update', state.snapshot())
+        else:
+            emit('status_patch', {"version": current, "base": version, "ops": ops})
 
     @socketio.on('disconnect')
     def handle_disconnect():
         print('❌ Client disconnected')
+        sequences.forget(request.sid)
+        # Keep whatever a distress recording got through before the drop
+        for upload, audio_ref in uploads.finish_sid(request.sid):
+            complete_stream(upload, audio_ref, upload.meta)
+
+    @socketio.on('rover_control')
+    def handle_rover_control(data):
+        """
+        Low-latency rover control over the socket.
+
+        Accepts {rover_id, command, seq} or {commands: [...]} of those.
+        Commands whose seq is not newer than the last one seen from this
+        client for that rover are dropped. Acks with each rover's latest
+        seq and position, e.g. {"rovers": {"jetson": [12, lat, lon]}, "dropped": 1}.
+        """
+        if not isinstance(data, dict):
+            return {"error": "Expected an object"}
+        commands = data.get('commands') if 'commands' in data else [data]
+        if not isinstance(commands, list):
+            return {"error": "commands must be a list"}
+
+        # Group accepted commands per rover, keeping their order
+        accepted = {}
+        last_seq = {}
+        dropped = 0
+        for cmd in commands:
+            if not isinstance(cmd, dict):
+                dropped += 1
+                continue
+            rover_id, command, seq = cmd.get('rover_id'), cmd.get('command'), cmd.get('seq')
+            if not isinstance(rover_id, str) or not state.has('rovers', rover_id) \
+                    or command not in VALID_COMMANDS \
+                    or not sequences.is_new(request.sid, rover_id, seq):
+                dropped += 1
+                continue
+            if seq is not None:
+                # Also newer than anything earlier in this same message
+                if rover_id in last_seq and seq <= last_seq[rover_id]:
+                    dropped += 1
+                    continue
+                last_seq[rover_id] = seq
+            accepted.setdefault(rover_id, []).append(command)
+
+        # Queue everything first so rovers apply in parallel, then collect.
+        # A seq is only used up once its command is queued, so a command
+        # turned away by a full queue can be retried with the same seq.
+        tickets = {}
+        for rover_id, rover_commands in accepted.items():
+            ticket = executor.submit(rover_id, rover_commands)
+            if ticket is None:
+                dropped += len(rover_commands)
+            else:
+                sequences.record(request.sid, rover_id, last_seq.get(rover_id))
+                tickets[rover_id] = ticket
+
+        acks = {}
+        for rover_id, ticket in tickets.items():
+            rover = ticket.wait(timeout=1.0)
+            if rover is not None:
+                acks[rover_id] = [last_seq.get(rover_id), rover['lat'], rover['lon']]
+        return {"rovers": acks, "dropped": dropped}
     
-    @socketio.on('distress_signal')
-    def handle_distress_signal(data):
-        """Handle emergency distress signals from User Panel"""
-        print(f"DISTRESS SIGNAL RECEIVED: {data}")
-        
-        # Build enriched distress alert
+    def build_distress(data):
+        """Enriched distress alert for a User Panel signal (without audio handling)"""
         distress = {
+            "id": uuid.uuid4().hex,
             "type": "DISTRESS",
             "level": "critical",
             "message": f"🚨 EMERGENCY DISTRESS SIGNAL from {data.get('location', 'Unknown Location')}",
@@ -28,49 +111,163 @@ def register_socketio_events(socketio):
             "trigger": data.get('trigger', 'Manual'),  # Manual or Voice Activation
             "location": data.get('location', 'Unknown'),
             "audio": data.get('audio', False),
-            "transcript": None
+            "transcript": None,
+            "transcript_pending": False,
+            "audio_ref": None,
+            "nearest_rovers": []
         }
+
+        # Closest idle rovers, so the operator can dispatch without the map
+        coords = parse_location(data.get('location'))
+        if coords is not None:
+            distress['nearest_rovers'] = rover_locator.nearest_idle(*coords)
+        return distress
+
+    def frontend_transcript(data):
+        transcript = data.get('transcript')
+        if transcript and transcript != 'Emergency distress signal':
+            print(f"Using frontend transcript: {transcript}")
+            return transcript
+        return None
+
+    def transcribe_later(alert_id, audio):
+        """Transcribe in the worker pool; the transcript follows as an alert_update"""
+        def send_transcript(transcript):
+            print(f"Transcript ready for alert {alert_id}: {transcript}")
+            socketio.emit('alert_update', {
+                "id": alert_id,
+                "transcript": transcript,
+                "transcript_pending": False,
+            })
+
+        if not transcription_pool.submit(audio, send_transcript):
+            send_transcript(BUSY_TRANSCRIPT)
+
+    @socketio.on('distress_signal')
+    def handle_distress_signal(data):
+        """Handle emergency distress signals from User Panel"""
+        # Everything but the audio itself, which can be megabytes of base64
+        print(f"DISTRESS SIGNAL RECEIVED: { {k: v for k, v in data.items() if k != 'audio_data'} }")
+        
+        # Build enriched distress alert
+        distress = build_distress(data)
         
         # If audio exists, handle real or mock audio
+        audio_bytes = None
         if data.get('audio'):
             try:
                 # Check if we have real audio data (base64)
                 audio_data = data.get('audio_data')
                 
                 if audio_data and audio_data != 'mock_audio_blob_5s':
-                    # Real audio: decode base64
+                    # Real audio: decode base64 into the blob store; alerts
+                    # carry only a reference, served over HTTP at audio_ref.url
                     import base64
                     try:
                         audio_bytes = base64.b64decode(audio_data)
                         print(f"Received real audio: {len(audio_bytes)} bytes")
-                        
-                        # Optional: Save to file
-                        # timestamp_str = datetime.now().strftime('%Y%m%d_%H%M%S')
-                        # filename = f"audio/distress_{timestamp_str}.webm"
-                        # with open(filename, 'wb') as f:
-                        #     f.write(audio_bytes)
-                        # print(f"Audio saved to {filename}")
+                        distress['audio_ref'] = audio_store.put(
+                            audio_bytes, duration=data.get('audio_duration'))
                     except Exception as e:
-                        print(f"Error decoding audio: {e}")
+                        print(f"Error storing audio: {e}")
                 
-                # Use frontend transcript if available, otherwise fallback to mock
-                frontend_transcript = data.get('transcript')
-                if frontend_transcript and frontend_transcript != 'Emergency distress signal':
-                    distress['transcript'] = frontend_transcript
-                    print(f"Using frontend transcript: {frontend_transcript}")
-                else:
-                    # Fallback to mock transcription
-                    transcript = transcribe_audio_wisprflow(audio_data)
+                # Use frontend transcript if available, otherwise transcribe it here
+                transcript = frontend_transcript(data)
+                if transcript:
                     distress['transcript'] = transcript
-                    print(f"Using mock transcript: {transcript}")
-                
-                # Forward audio data to Admin Panel
-                distress['audio_data'] = audio_data
-                    
+                else:
+                    # Resent or replayed audio is already transcribed (the blob
+                    # hash is the cache key); otherwise transcribe in the worker
+                    # pool: the alert goes out now and the transcript follows
+                    # as an alert_update
+                    if distress['audio_ref']:
+                        key = distress['audio_ref']['hash']
+                    else:
+                        key = audio_key(audio_data) if audio_data else None
+                    cached = transcript_cache.lookup(key) if key else None
+                    if cached is not None:
+                        distress['transcript'] = cached
+                    else:
+                        distress['transcript_pending'] = True
+
             except Exception as e:
                 print(f"Audio processing error: {e}")
                 distress['transcript'] = "[Transcription unavailable]"
         
         # Broadcast to all admin panels
-        socketio.emit('alert', distress, broadcast=True, include_self=True)
+        socketio.emit('alert', distress)
         print("Distress alert broadcasted to ALL connected Admin Panels")
+
+        if distress['transcript_pending']:
+            # Decoded bytes, as streamed uploads send; the mock blob id or
+            # undecodable text goes as it came
+            transcribe_later(distress['id'],
+                             audio_bytes if audio_bytes is not None else data.get('audio_data'))
+
+    def complete_stream(upload, audio_ref, final):
+        """Attach the stored recording to its alert, then settle the transcript"""
+        print(f"Distress audio complete for alert {upload.alert_id}: {upload.size} bytes")
+        update = {"id": upload.alert_id, "audio_ref": audio_ref, "audio_streaming": False}
+
+        transcript = frontend_transcript(final)
+        if transcript is None and audio_ref is not None:
+            transcript = transcript_cache.lookup(audio_ref['hash'])
+        elif transcript is None:
+            transcript = "[Transcription unavailable]"
+        if transcript is not None:
+            update.update(transcript=transcript, transcript_pending=False)
+        socketio.emit('alert_update', update)
+
+        if transcript is None:
+            with open(audio_store.path(audio_ref['hash']), 'rb') as f:
+                transcribe_later(upload.alert_id, f.read())
+
+    @socketio.on('distress_audio_chunk')
+    def handle_distress_audio_chunk(data):
+        """
+        Streamed distress recording, one binary chunk per event:
+        {upload_id, seq, data, final}. Chunk 0 also carries the signal fields
+        (location, trigger, timestamp) and sends the alert straight away; the
+        final chunk may add transcript and audio_duration. Acks with
+        {ok, received} or {ok: False, error}.
+        """
+        data = data if isinstance(data, dict) else {}
+        seq = data.get('seq')
+        try:
+            if seq == 0:
+                # A client already streaming its upload limit gets no new
+                # alert: each of those recordings raised one
+                uploads.check_room(request.sid)
+                # The alert goes out on the signal fields alone: bad audio
+                # must never silence a distress signal
+                meta = {k: v for k, v in data.items() if k != 'data'}
+                print(f"DISTRESS STREAM STARTED: {meta}")
+                distress = build_distress(meta)
+                distress.update(audio=True, audio_streaming=True, transcript_pending=True)
+                socketio.emit('alert', distress)
+                print("Distress alert broadcasted to ALL connected Admin Panels")
+                try:
+                    upload = uploads.start(data.get('upload_id'), request.sid, distress['id'], meta)
+                    try:
+                        size = uploads.append(upload, seq, data.get('data') or b'')
+                    except UploadError:
+                        uploads.finish(upload)  # nothing written: drops the upload
+                        raise
+                except UploadError as e:
+                    print(f"Distress audio rejected for alert {distress['id']}: {e}")
+                    socketio.emit('alert_update', {
+                        "id": distress['id'],
+                        "audio_streaming": False,
+                        "transcript": frontend_transcript(meta) or "[Transcription unavailable]",
+                        "transcript_pending": False,
+                    })
+                    raise
+            else:
+                upload = uploads.get(data.get('upload_id'), request.sid)
+                size = uploads.append(upload, seq, data.get('data') or b'')
+        except UploadError as e:
+            return {"ok": False, "error": str(e)}
+
+        if data.get('final'):
+            complete_stream(upload, uploads.finish(upload, data.get('audio_duration')), data)
+        return {"ok": True, "received": size}
@@ -27,7 +27,11 @@ export default function UserPanel() {
     const [backgroundTranscript, setBackgroundTranscript] = useState('');
 
     const mediaRecorderRef = useRef<MediaRecorder | null>(null);
-    const audioChunksRef = useRef<Blob[]>([]);
+    const recordStartRef = useRef(0);
+    // Streamed upload: chunks go out in order while recording continues
+    const uploadIdRef = useRef('');
+    const chunkSeqRef = useRef(0);
+    const sendChainRef = useRef<Promise<void>>(Promise.resolve());
     const recognitionRef = useRef<any>(null);
     const wakeWordRecognitionRef = useRef<any>(null);
     const isTriggeringRef = useRef(false);
@@ -77,18 +81,28 @@ export default function UserPanel() {
         };
     }, []);
 
-    // Convert blob to base64
-    const blobToBase64 = (blob: Blob): Promise<string> => {
-        return new Promise((resolve, reject) => {
-            const reader = new FileReader();
-            reader.onloadend = () => {
-                const base64 = reader.result as string;
-                // Remove data URL prefix
-                const base64Data = base64.split(',')[1];
-                resolve(base64Data);
-            };
-            reader.onerror = reject;
-            reader.readAsDataURL(blob);
+    // Queue one recorded chunk for the backend. Chunk 0 carries the signal
+    // fields, so the alert goes out as soon as recording starts; `extra` rides
+    // on the final chunk (transcript, duration).
+    const sendAudioChunk = (
+        data: Blob | null,
+        final: boolean,
+        signal: Record<string, unknown>,
+        extra: Record<string, unknown> = {}
+    ) => {
+        sendChainRef.current = sendChainRef.current.then(async () => {
+            const buffer = data ? await data.arrayBuffer() : new ArrayBuffer(0);
+            const seq = chunkSeqRef.current++;
+            socket.emit('distress_audio_chunk', {
+                upload_id: uploadIdRef.current,
+                seq,
+                data: buffer,
+                final,
+                ...(seq === 0 ? signal : {}),
+                ...extra
+            }, (ack: { ok: boolean; error?: string }) => {
+                if (!ack?.ok) console.error('Audio chunk rejected:', ack?.error);
+            });
         });
     };
 
@@ -270,7 +284,8 @@ export default function UserPanel() {
         setRecording(true);
         setTriggerMethod(trigger);
         setTranscriptText(''); // Reset transcript
-        audioChunksRef.current = [];
+        uploadIdRef.current = crypto.randomUUID().replace(/-/g, '');
+        chunkSeqRef.current = 0;
 
         try {
             // Request microphone permission
@@ -290,39 +305,39 @@ export default function UserPanel() {
 
             mediaRecorderRef.current = mediaRecorder;
 
+            const signal = {
+                type: 'DISTRESS_SIGNAL',
+                source: 'user_panel',
+                trigger: trigger === 'manual' ? 'Manual' : 'Voice Activation',
+                timestamp: new Date().toISOString(),
+                location: location,
+                audio: true
+            };
+
             mediaRecorder.ondataavailable = (event) => {
                 if (event.data.size > 0) {
-                    audioChunksRef.current.push(event.data);
+                    sendAudioChunk(event.data, false, signal);
                 }
             };
 
             mediaRecorder.onstop = async () => {
+                // MediaRecorder WebM carries no duration header, so send our own
+                const audioDuration = (Date.now() - recordStartRef.current) / 1000;
+
                 // Stop all tracks
                 stream.getTracks().forEach(track => track.stop());
 
-                // Create audio blob
-                const audioBlob = new Blob(audioChunksRef.current, { type: 'audio/webm' });
-
-                // Convert to base64
-                const base64Audio = await blobToBase64(audioBlob);
-
                 // Wait a bit for speech recognition to complete
                 await new Promise(resolve => setTimeout(resolve, 500));
 
-                // Send distress signal with real audio
-                console.log('🚨 Emitting distress signal to backend...', {
+                // Close the streamed upload; the alert went out with the first chunk
+                console.log('🚨 Finishing distress audio upload...', {
                     socket_connected: socket.connected,
                     socket_id: socket.id
                 });
 
-                socket.emit('distress_signal', {
-                    type: 'DISTRESS_SIGNAL',
-                    source: 'user_panel',
-                    trigger: trigger === 'manual' ? 'Manual' : 'Voice Activation',
-                    timestamp: new Date().toISOString(),
-                    location: location,
-                    audio: true,
-                    audio_data: base64Audio,
+                sendAudioChunk(null, true, signal, {
+                    audio_duration: audioDuration,
                     transcript: transcriptText || 'Emergency distress signal'
                 });
 
@@ -338,8 +353,9 @@ export default function UserPanel() {
                 clearTimeout(deadlockTimeout);
             };
 
-            // Start recording
-            mediaRecorder.start();
+            // Start recording, handing over a chunk every second
+            mediaRecorder.start(1000);
+            recordStartRef.current = Date.now();
 
             // Stop after 8 seconds
             setTimeout(() => {
@@ -1,6 +1,6 @@
 'use client';
 
-import { Alert } from '@/types';
+import { Alert, AlertUpdate, AudioRef } from '@/types';
 import { AlertCircle, Volume2, Play, Square } from 'lucide-react';
 import { useEffect, useState, useRef } from 'react';
 
@@ -9,6 +9,8 @@ import { useEffect, useState, useRef } from 'react';
 
 import { socket } from '@/lib/socket';
 
+const BACKEND_URL = 'http://localhost:5001';
+
 export default function AlertsPanel() {
     const [alerts, setAlerts] = useState<Alert[]>([]);
     const [playingIdx, setPlayingIdx] = useState<number | null>(null);
@@ -25,18 +27,25 @@ export default function AlertsPanel() {
             setAlerts(prev => [alertObj, ...prev].slice(0, 5));
         };
 
+        // Late fields for an alert already shown (e.g. the transcript)
+        const handleAlertUpdate = (update: AlertUpdate) => {
+            setAlerts(prev => prev.map(a => (a.id === update.id ? { ...a, ...update } : a)));
+        };
+
         console.log('📍 AlertsPanel: Setting up socket listener for "alert" event');
         socket.on('alert', handleAlert);
+        socket.on('alert_update', handleAlertUpdate);
 
         return () => {
             socket.off('alert', handleAlert);
+            socket.off('alert_update', handleAlertUpdate);
             if (audioRef.current) {
                 audioRef.current.pause();
             }
         };
     }, []);
 
-    const playBase64Audio = (base64Data: string, idx: number) => {
+    const playAudio = (recording: AudioRef, idx: number) => {
         if (playingIdx === idx) {
             if (audioRef.current) {
                 audioRef.current.pause();
@@ -51,8 +60,8 @@ export default function AlertsPanel() {
         }
 
         try {
-            const audioSrc = `data:audio/webm;base64,${base64Data}`;
-            const audio = new Audio(audioSrc);
+            // Streamed from the backend blob store (Range requests, cacheable)
+            const audio = new Audio(`${BACKEND_URL}${recording.url}`);
             audioRef.current = audio;
             setPlayingIdx(idx);
 
@@ -100,6 +109,9 @@ export default function AlertsPanel() {
                             )}
 
                             {/* Transcript Preview */}
+                            {!alert.transcript && alert.transcript_pending && (
+                                <p className="mt-2 text-xs italic text-slate-400">📄 Transcribing…</p>
+                            )}
                             {alert.transcript && (
                                 <div className="mt-2 p-2 bg-slate-800/50 rounded text-xs italic border-l-2 border-cyan-500">
                                     <div className="flex items-start gap-2">
@@ -110,9 +122,12 @@ export default function AlertsPanel() {
                             )}
 
                             {/* Audio Indicator */}
-                            {alert.audio && alert.audio_data && (
+                            {alert.audio_streaming && (
+                                <p className="mt-2 text-xs italic text-slate-400">🎙️ Receiving audio…</p>
+                            )}
+                            {alert.audio && alert.audio_ref && (
                                 <button
-                                    onClick={() => playBase64Audio(alert.audio_data!, idx)}
+                                    onClick={() => playAudio(alert.audio_ref!, idx)}
                                     className={`mt-2 p-2 rounded-lg text-xs font-bold transition-all flex items-center gap-2 ${playingIdx === idx
                                             ? 'bg-cyan-500 text-white animate-pulse'
                                             : 'bg-slate-800 text-cyan-400 hover:bg-slate-700 border border-cyan-900/50'
@@ -127,6 +142,7 @@ export default function AlertsPanel() {
                                         <>
                                             <Volume2 className="w-3 h-3" />
                                             PLAY VOICE MESSAGE
+                                            {alert.audio_ref.duration ? ` (${Math.round(alert.audio_ref.duration)}s)` : ''}
                                         </>
                                     )}
                                 </button>
@@ -136,6 +152,15 @@ export default function AlertsPanel() {
                             {alert.location && alert.location !== 'Unknown' && (
                                 <p className="mt-1 text-xs text-slate-500">📍 {alert.location}</p>
                             )}
+
+                            {/* Dispatch candidates */}
+                            {alert.nearest_rovers && alert.nearest_rovers.length > 0 && (
+                                <p className="mt-1 text-xs text-slate-500">
+                                    🚙 Nearest idle: {alert.nearest_rovers
+                                        .map(r => `${r.rover_id.toUpperCase()} (${Math.round(r.distance_m)} m)`)
+                                        .join(', ')}
+                                </p>
+                            )}
                         </div>
                     ))
                 )}
@@ -1,14 +1,30 @@
 'use client';
 
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { socket } from '@/lib/socket';
-import { SystemStatus, RoverId } from '@/types';
+import { SystemStatus, RoverId, StatusPatch, PatchOp } from '@/types';
 import { Battery, Activity } from 'lucide-react';
 import RoverControl from './RoverControl';
 import CameraFeed from './CameraFeed';
 import MissionForm from './MissionForm';
 import AlertsPanel from './AlertsPanel';
 
+// Apply [path, value] (set) / [path] (remove) ops to a copy of the state
+function applyOps<T>(state: T, ops: PatchOp[]): T {
+    const next: any = structuredClone(state);
+    for (const [path, ...value] of ops) {
+        let node = next;
+        for (const key of path.slice(0, -1)) {
+            node[key] = node[key] ?? {};
+            node = node[key];
+        }
+        const last = path[path.length - 1];
+        if (value.length === 0) delete node[last];
+        else node[last] = value[0];
+    }
+    return next;
+}
+
 export default function Dashboard() {
     const [status, setStatus] = useState<SystemStatus>({
         type: 'STATUS',
@@ -23,19 +39,34 @@ export default function Dashboard() {
     });
     const [connected, setConnected] = useState(false);
     const [activeRover, setActiveRover] = useState<RoverId>('jetson');
+    const versionRef = useRef(-1);
 
     useEffect(() => {
         socket.on('connect', () => setConnected(true));
         socket.on('disconnect', () => setConnected(false));
 
         socket.on('status_update', (data: any) => {
+            if (typeof data.version === 'number') versionRef.current = data.version;
             setStatus(prev => ({ ...prev, ...data }));
         });
 
+        // Incremental updates: apply in order, resync if we missed one
+        socket.on('status_patch', (patch: StatusPatch) => {
+            if (patch.base !== versionRef.current) {
+                if (patch.version > versionRef.current) {
+                    socket.emit('status_sync', { version: versionRef.current });
+                }
+                return;
+            }
+            versionRef.current = patch.version;
+            setStatus(prev => applyOps(prev, patch.ops));
+        });
+
         return () => {
             socket.off('connect');
             socket.off('disconnect');
             socket.off('status_update');
+            socket.off('status_patch');
         };
     }, []);
 
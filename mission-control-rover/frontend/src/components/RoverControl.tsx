@@ -1,7 +1,8 @@
 'use client';
 
-import { useState } from 'react';
-import { RoverCommandType, RoverId } from '@/types';
+import { useRef, useState } from 'react';
+import { socket } from '@/lib/socket';
+import { RoverCommandType, RoverId, RoverControlAck } from '@/types';
 import { ArrowUp, ArrowDown, ArrowLeft, ArrowRight, Octagon } from 'lucide-react';
 
 interface RoverControlProps {
@@ -11,10 +12,22 @@ interface RoverControlProps {
 export default function RoverControl({ activeRover = 'jetson' }: RoverControlProps) {
     if (!activeRover) console.error('RoverControl: activeRover is missing!');
     const [lastCommand, setLastCommand] = useState<string | null>(null);
+    const seqRef = useRef<Record<string, number>>({});
 
     const sendCommand = async (command: RoverCommandType) => {
+        setLastCommand(`${activeRover.toUpperCase()}: ${command}`);
+
+        // One websocket frame per command; the server drops stale/duplicate seqs
+        if (socket.connected) {
+            const seq = (seqRef.current[activeRover] ?? 0) + 1;
+            seqRef.current[activeRover] = seq;
+            socket.emit('rover_control', { rover_id: activeRover, command, seq }, (ack: RoverControlAck) => {
+                if (!ack?.rovers?.[activeRover]) console.warn('rover_control dropped', ack);
+            });
+            return;
+        }
+
         try {
-            setLastCommand(`${activeRover.toUpperCase()}: ${command}`);
             const res = await fetch('http://localhost:5001/rover/control', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
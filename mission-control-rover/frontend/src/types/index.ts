@@ -14,6 +14,12 @@ export interface RoverCommand {
     command: RoverCommandType;
 }
 
+// rover_control ack: rover_id -> [last seq, lat, lon]
+export interface RoverControlAck {
+    rovers: Record<string, [number | null, number, number]>;
+    dropped: number;
+}
+
 export type MissionState = 'idle' | 'active' | 'completed';
 export type RoverStatus = 'online' | 'offline' | 'error';
 
@@ -24,29 +30,73 @@ export interface RoverState {
     moving: boolean;
     lat: number;
     lon: number;
+    battery?: number;
+    last_seen?: number | null;
+    mission?: string | null;  // Assigned mission id
     camera_url?: string;
 }
 
 export interface SystemStatus {
     type: 'STATUS';
+    version?: number;
     battery: number;
     mission_state: MissionState;
     rovers: Record<RoverId, RoverState>;
     payload: MissionPayload | null;
     priority: MissionPriority | null;
+    missions?: MissionCounts;
+}
+
+export interface MissionCounts {
+    pending: number;
+    assigned: number;
+    completed: number;
+    cancelled: number;
+}
+
+// [path, value] sets a value, [path] removes it
+export type PatchOp = [string[], any?];
+
+export interface StatusPatch {
+    version: number;
+    base: number;
+    ops: PatchOp[];
 }
 
 export type AlertLevel = 'info' | 'warning' | 'critical';
 
 export interface Alert {
+    id?: string;          // Set on alerts that may receive an alert_update
     type: 'ALERT' | 'DISTRESS';
     level: AlertLevel;
     message: string;
     timestamp: string;
     transcript?: string;  // Audio transcription from WisprFlow
+    transcript_pending?: boolean;  // Transcript will follow in an alert_update
     audio?: boolean;      // Audio attachment flag
     source?: string;      // Source of alert (e.g., 'user_panel', 'rover')
     location?: string;    // Location information
     trigger?: string;     // Activation method: 'Manual' or 'Voice Activation'
-    audio_data?: string;  // Base64 encoded audio data
+    audio_ref?: AudioRef | null;  // Recording in the backend blob store
+    audio_streaming?: boolean;    // Recording still uploading; audio_ref follows
+    nearest_rovers?: DispatchCandidate[];  // Closest idle rovers to the location
+}
+
+// Content-addressed recording; fetch it from the backend at `url`
+export interface AudioRef {
+    hash: string;
+    size: number;             // Bytes
+    duration: number | null;  // Seconds, when known
+    content_type: string;
+    url: string;              // Backend-relative, e.g. /audio/<hash>
+}
+
+// Follow-up fields for an alert already sent, matched by id
+export type AlertUpdate = Partial<Alert> & { id: string };
+
+export interface DispatchCandidate {
+    rover_id: string;
+    distance_m: number;
+    lat: number;
+    lon: number;
 }